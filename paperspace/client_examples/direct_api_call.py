@@ -8,9 +8,53 @@ Call this directly from your Python application or backend.
 
 import os
 import re
+import queue
+import logging
+import logging.handlers
 import time
+import asyncio
+import importlib.util
+import random
+import json
+import threading
+import uuid
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Union
+
+# Optional fast JSON encoder/decoder (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional async client for fan-out batches
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Optional on-disk cache for workflow status responses
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Optional streaming JSON parser: read only the fields a status poll needs
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# HTTP/2 in httpx needs the `h2` extra (pip install 'httpx[http2]')
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
 
 
 # =============================================================================
@@ -21,17 +65,148 @@ PAPERSPACE_API_KEY = os.environ.get('PAPERSPACE_API_KEY')
 PAPERSPACE_WORKFLOW_ID = os.environ.get('PAPERSPACE_WORKFLOW_ID')
 PAPERSPACE_API_URL = 'https://api.paperspace.io/v1/workflows/runs'
 
+# Optional batch gateway (e.g. APISIX `batch-requests` plugin) in front of the API
+PAPERSPACE_BATCH_URL = os.environ.get('PAPERSPACE_BATCH_URL')
+PAPERSPACE_RUNS_PATH = '/v1/workflows/runs'
+
+# Status polling: start fast, back off exponentially, never wait more than 30s
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_BACKOFF = 1.5
+
+# Long-poll: ask the API to hold the status request open until the run changes
+LONG_POLL_WAIT = 60
+# A response counts as held open only after this fraction of the wait
+LONG_POLL_HELD_FRACTION = 0.8
+
+# Status cache tiers (seconds): in-flight runs change often, finished runs never
+STATUS_CACHE_DIR = os.environ.get('PAPERSPACE_CACHE_DIR', os.path.expanduser('~/.paperspace_cache'))
+STATUS_CACHE_TTL_SHORT = 10
+STATUS_CACHE_TTL_LONG = 6 * 60 * 60
+TERMINAL_STATUSES = ('succeeded', 'failed')
+
+# Top-level run fields read while streaming an in-flight status response
+_STREAMED_RUN_FIELDS = ('status', 'version')
+
+_SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+
+# Batch dispatch: worker threads and max pipeline triggers started per second
+BATCH_MAX_WORKERS = 8
+TRIGGER_RATE_LIMIT = 2
+
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Send this module's logs to stdout through a background queue listener.
+    
+    Worker threads only enqueue records, so batch dispatch never contends on
+    the stdout lock. Call ``listener.stop()`` before exit to flush.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    listener.start()
+    return listener
+
+
+# =============================================================================
+# HTTP SESSION
+# =============================================================================
+
+# Built once at import; every client below shares these instead of rebuilding
+# the header dict per request.
+_AUTH_HEADERS = {
+    'Authorization': f'Bearer {PAPERSPACE_API_KEY}',
+    'Content-Type': 'application/json',
+}
+_RUN_URL_PREFIX = PAPERSPACE_API_URL + '/'
+
+# Shared session so repeated calls (batch triggers, status polling) reuse the
+# same keep-alive TLS connection instead of reconnecting every time.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
+_SESSION.headers.update(_AUTH_HEADERS)
+_SESSION.headers['Connection'] = 'keep-alive'
+
+
+# =============================================================================
+# DATA MODEL
+# =============================================================================
+
+@dataclass(slots=True)
+class CompanyData:
+    """Company information sent to the pipeline as workflow inputs."""
+    company_name: str
+    company_description: str = ''
+    use_cases_count: int = 7
+    readiness_score: int = 50
+    readiness_category: str = 'Explorer'
+    report_expectations: str = ''
+    google_drive_link: str = ''
+    
+    def __post_init__(self):
+        if not self.company_name:
+            raise ValueError('company_name is required')
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompanyData':
+        """Build from a request/JSON dict, ignoring unknown keys."""
+        try:
+            name = data['company_name']
+        except KeyError:
+            raise ValueError('company_name is required') from None
+        return cls(name, **{key: data[key] for key in _OPTIONAL_FIELDS if key in data})
+    
+    @classmethod
+    def coerce(cls, data: Union['CompanyData', Dict[str, Any]]) -> 'CompanyData':
+        """Accept either a CompanyData or a plain dict."""
+        return data if isinstance(data, cls) else cls.from_dict(data)
+    
+    def to_workflow_inputs(self) -> Dict[str, str]:
+        """Map to the Paperspace workflow input dict (all values are strings)."""
+        name = self.company_name
+        return {
+            'company_name': name,
+            'company_slug': slugify(name),
+            'use_cases_count': str(self.use_cases_count),
+            'company_description': self.company_description,
+            'readiness_score': str(self.readiness_score),
+            'readiness_category': self.readiness_category,
+            'report_expectations': self.report_expectations,
+            'google_drive_link': self.google_drive_link,
+        }
+
+
+_OPTIONAL_FIELDS = tuple(f.name for f in fields(CompanyData))[1:]
+
+
+def _company_label(company: Union[CompanyData, Dict[str, Any]]) -> Optional[str]:
+    if isinstance(company, CompanyData):
+        return company.company_name
+    return company.get('company_name')
+
 
 # =============================================================================
 # MAIN FUNCTION
 # =============================================================================
 
-def trigger_ai_pipeline(company_data: Dict[str, Any]) -> Dict[str, Any]:
+def trigger_ai_pipeline(company_data: Union[CompanyData, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Trigger AI pipeline for a company.
     
     Args:
-        company_data: Company information dict with keys:
+        company_data: CompanyData, or a company information dict with keys:
             - company_name (required)
             - company_description
             - use_cases_count
@@ -43,47 +218,30 @@ def trigger_ai_pipeline(company_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Workflow run details
     """
-    # Validate required fields
-    if not company_data.get('company_name'):
-        raise ValueError('company_name is required')
+    company = CompanyData.coerce(company_data)
+    workflow_inputs = company.to_workflow_inputs()
     
-    print(f"🚀 Triggering AI pipeline for: {company_data['company_name']}")
-    
-    # Prepare workflow inputs
-    workflow_inputs = {
-        'company_name': company_data['company_name'],
-        'company_slug': slugify(company_data['company_name']),
-        'use_cases_count': str(company_data.get('use_cases_count', 7)),
-        'company_description': company_data.get('company_description', ''),
-        'readiness_score': str(company_data.get('readiness_score', 50)),
-        'readiness_category': company_data.get('readiness_category', 'Explorer'),
-        'report_expectations': company_data.get('report_expectations', ''),
-        'google_drive_link': company_data.get('google_drive_link', ''),
-    }
-    
-    print(f"📋 Workflow inputs: {workflow_inputs}")
+    logger.info("🚀 Triggering AI pipeline for: %s", company.company_name)
+    logger.debug("📋 Workflow inputs: %s", workflow_inputs)
     
     # Call Paperspace API
-    response = requests.post(
+    response = _SESSION.post(
         PAPERSPACE_API_URL,
-        headers={
-            'Authorization': f'Bearer {PAPERSPACE_API_KEY}',
-            'Content-Type': 'application/json',
-        },
-        json={
+        data=json_dumps({
             'workflowId': PAPERSPACE_WORKFLOW_ID,
             'inputs': workflow_inputs,
-        }
+        })
     )
     
     if not response.ok:
         raise Exception(f'Paperspace API error: {response.status_code} - {response.text}')
     
-    result = response.json()
+    result = json_loads(response.content)
     
-    print('✅ Pipeline triggered successfully!')
-    print(f"📊 Run ID: {result['id']}")
-    print(f"🔗 Monitor at: https://console.paperspace.com/workflows/{PAPERSPACE_WORKFLOW_ID}/runs/{result['id']}")
+    logger.info('✅ Pipeline triggered successfully!')
+    logger.info("📊 Run ID: %s", result['id'])
+    logger.info("🔗 Monitor at: https://console.paperspace.com/workflows/%s/runs/%s",
+                PAPERSPACE_WORKFLOW_ID, result['id'])
     
     return result
 
@@ -92,9 +250,37 @@ def trigger_ai_pipeline(company_data: Dict[str, Any]) -> Dict[str, Any]:
 # HELPER FUNCTIONS
 # =============================================================================
 
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def slugify(text: str) -> str:
     """Convert company name to filesystem-safe slug."""
-    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_').lower()
+    return _SLUG_RE.sub('_', text).strip('_').lower()
+
+
+def _long_poll_answered(run: Dict[str, Any], since_version: Any, elapsed: float) -> bool:
+    """
+    True if a long-poll response justifies re-polling without a sleep: the
+    run's version moved past since_version, or the server really held the
+    request open. An instant reply with an unchanged version (wait ignored,
+    or a conditional 304) falls back to the normal backoff.
+    """
+    if 'version' not in run:
+        return False
+    if run['version'] != since_version:
+        return True
+    return elapsed >= LONG_POLL_WAIT * LONG_POLL_HELD_FRACTION
 
 
 def monitor_workflow(run_id: str) -> Dict[str, Any]:
@@ -107,29 +293,397 @@ def monitor_workflow(run_id: str) -> Dict[str, Any]:
     Returns:
         Final workflow run status
     """
-    status_url = f'https://api.paperspace.io/v1/workflows/runs/{run_id}'
+    status_url = _RUN_URL_PREFIX + run_id
+    delay = POLL_INITIAL_DELAY
+    last_status = None
+    long_poll = True
+    since_version = None
     
     while True:
-        response = requests.get(
-            status_url,
-            headers={
-                'Authorization': f'Bearer {PAPERSPACE_API_KEY}',
+        if long_poll:
+            params = {'wait': LONG_POLL_WAIT}
+            if since_version is not None:
+                params['since_version'] = since_version
+            started = time.monotonic()
+            status_code, run = _fetch_run(run_id, status_url, params=params,
+                                          timeout=LONG_POLL_WAIT + 5)
+            if status_code in (400, 404):
+                # Long-polling not supported: fall back to backoff polling
+                long_poll = False
+                status_code, run = _fetch_run(run_id, status_url)
+        else:
+            status_code, run = _fetch_run(run_id, status_url)
+        
+        logger.info("📊 Status: %s", run['status'])
+        
+        if run['status'] == 'succeeded':
+            logger.info('✅ Pipeline completed successfully!')
+            return run
+        elif run['status'] == 'failed':
+            logger.error('❌ Pipeline failed')
+            raise Exception('Workflow failed')
+        
+        if long_poll and 'version' in run:
+            answered = _long_poll_answered(run, since_version, time.monotonic() - started)
+            since_version = run['version']
+            if answered:
+                # The server waited for (or reported) a change; re-issue immediately
+                continue
+        else:
+            # No version in the response means the wait parameter was ignored
+            long_poll = False
+        
+        # Status changed (e.g. pending -> running): check again soon
+        if run['status'] != last_status:
+            delay = POLL_INITIAL_DELAY
+            last_status = run['status']
+        
+        # Exponential backoff with jitter before checking again
+        time.sleep(min(delay, POLL_MAX_DELAY) + random.uniform(0, 0.5))
+        delay *= POLL_BACKOFF
+
+
+_status_cache_instance = None
+
+# Last 200 response per run (validators + body), kept even without diskcache
+_LAST_RESPONSE: Dict[str, Dict[str, Any]] = {}
+
+# Last validators per run ({etag, last_modified, status, version}), written on
+# every 200 -- including streamed partial reads -- so a 304 can be answered
+_LAST_VALIDATORS: Dict[str, Dict[str, Any]] = {}
+
+
+def _status_cache() -> Optional['diskcache.Cache']:
+    """Open the on-disk status cache lazily (None if diskcache is missing)."""
+    global _status_cache_instance
+    if _status_cache_instance is None and DISKCACHE_AVAILABLE:
+        _status_cache_instance = diskcache.Cache(STATUS_CACHE_DIR)
+    return _status_cache_instance
+
+
+def get_cached_run(run_id: str) -> Optional[Dict[str, Any]]:
+    """Return the last cached status body for a run, if any."""
+    cache = _status_cache()
+    if cache is None:
+        return None
+    entry = cache.get(('run', run_id))
+    return entry['body'] if entry else None
+
+
+def _stream_run_fields(response: requests.Response) -> Dict[str, Any]:
+    """
+    Stream-parse just the top-level status fields and drop the rest.
+    
+    The remainder of the body is read without parsing so the connection
+    goes back to the session pool instead of being closed.
+    """
+    response.raw.decode_content = True
+    run = {}
+    try:
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix in _STREAMED_RUN_FIELDS and event in ('string', 'number'):
+                run[prefix] = value
+                if len(run) == len(_STREAMED_RUN_FIELDS):
+                    break
+    finally:
+        try:
+            response.raw.drain_conn()
+        except Exception:
+            response.close()
+        else:
+            response.raw.release_conn()
+    return run
+
+
+def _fetch_run(run_id: str, status_url: str, **kwargs) -> tuple[int, Dict[str, Any]]:
+    """
+    GET a workflow run, revalidating the last response by ETag/Last-Modified.
+    
+    Full bodies and validators are cached separately: validators are kept
+    even for streamed in-flight reads (status/version only), so polling an
+    unchanged run is answered by a 304 either way.
+    
+    Returns:
+        (HTTP status code, run body); cache hits report 200
+    """
+    cache = _status_cache()
+    cached = cache.get(('run', run_id)) if cache is not None else None
+    if cached is None:
+        cached = _LAST_RESPONSE.get(run_id)
+    
+    # Finished runs never change: serve them straight from cache
+    if cached and cached['body'].get('status') in TERMINAL_STATUSES:
+        return 200, cached['body']
+    
+    validators = cache.get(('validators', run_id)) if cache is not None else None
+    if validators is None:
+        validators = _LAST_VALIDATORS.get(run_id) or cached
+    
+    # Conditional GET: an unchanged run comes back as an empty 304
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
+    response = _SESSION.get(status_url, headers=headers, stream=IJSON_AVAILABLE, **kwargs)
+    
+    if response.status_code == 304 and validators:
+        response.content  # empty body; consuming it returns the connection to the pool
+        # The full body if it is the one these validators describe, else status/version
+        if cached and cached.get('etag', '') == validators.get('etag', '') \
+                and cached.get('last_modified', '') == validators.get('last_modified', ''):
+            return 200, cached['body']
+        return 200, {k: validators[k] for k in _STREAMED_RUN_FIELDS if k in validators}
+    
+    partial = False
+    if IJSON_AVAILABLE and response.status_code == 200:
+        run = _stream_run_fields(response)
+        if run.get('status') in TERMINAL_STATUSES:
+            # Only a finished run needs its full body
+            response = _SESSION.get(status_url, **kwargs)
+            run = json_loads(response.content)
+        else:
+            partial = True
+    else:
+        run = json_loads(response.content)
+    
+    if response.status_code == 200:
+        etag = response.headers.get('ETag', '')
+        last_modified = response.headers.get('Last-Modified', '')
+        expire = (STATUS_CACHE_TTL_LONG if run.get('status') in TERMINAL_STATUSES
+                  else STATUS_CACHE_TTL_SHORT)
+        
+        entry = {'etag': etag, 'last_modified': last_modified, 'timestamp': time.time()}
+        entry.update((k, run[k]) for k in _STREAMED_RUN_FIELDS if k in run)
+        _LAST_VALIDATORS[run_id] = entry
+        if cache is not None:
+            cache.set(('validators', run_id), entry, expire=expire)
+        
+        # Only full bodies are cached as bodies: get_cached_run serves them
+        if not partial:
+            entry = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': run,
+                'timestamp': time.time(),
             }
-        )
+            _LAST_RESPONSE[run_id] = entry
+            if cache is not None:
+                cache.set(('run', run_id), entry, expire=expire)
+    
+    return response.status_code, run
+
+
+# =============================================================================
+# BATCH HELPERS
+# =============================================================================
+
+# Token bucket: each trigger takes a token that is returned one second later,
+# capping throughput at TRIGGER_RATE_LIMIT requests/second without a fixed sleep.
+_TRIGGER_TOKENS = threading.BoundedSemaphore(TRIGGER_RATE_LIMIT)
+
+
+def _rate_limited_trigger(company_data: Union[CompanyData, Dict[str, Any]]) -> Dict[str, Any]:
+    _TRIGGER_TOKENS.acquire()
+    threading.Timer(1.0, _TRIGGER_TOKENS.release).start()
+    return trigger_ai_pipeline(company_data)
+
+
+def trigger_batch(companies: List[Union[CompanyData, Dict[str, Any]]],
+                  max_workers: int = BATCH_MAX_WORKERS) -> List[str]:
+    """
+    Trigger pipelines for many companies concurrently.
+    
+    Returns:
+        Run IDs of the pipelines that started successfully
+    """
+    run_ids = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_rate_limited_trigger, company): company
+            for company in companies
+        }
+        for future in as_completed(futures):
+            try:
+                run_ids.append(future.result()['id'])
+            except Exception as e:
+                logger.error("Failed to trigger %s: %s", _company_label(futures[future]), e)
+    return run_ids
+
+
+def trigger_ai_pipeline_batch(companies: List[Union[CompanyData, Dict[str, Any]]]) -> List[str]:
+    """
+    Trigger pipelines for many companies in a single round trip.
+    
+    Requires PAPERSPACE_BATCH_URL pointing at a batch-requests gateway. Falls
+    back to trigger_batch (one request per company) when it is not configured
+    or the gateway rejects the batch.
+    
+    Returns:
+        Run IDs of the pipelines that started successfully
+    """
+    if not PAPERSPACE_BATCH_URL:
+        return trigger_batch(companies)
+    
+    companies = [CompanyData.coerce(company) for company in companies]
+    
+    pipeline = [
+        {
+            'method': 'POST',
+            'path': PAPERSPACE_RUNS_PATH,
+            'body': json_dumps({
+                'workflowId': PAPERSPACE_WORKFLOW_ID,
+                'inputs': company.to_workflow_inputs(),
+            }).decode('utf-8'),
+        }
+        for company in companies
+    ]
+    
+    logger.info("🚀 Triggering %d pipelines via batch endpoint", len(pipeline))
+    
+    response = _SESSION.post(PAPERSPACE_BATCH_URL, data=json_dumps({
+        'headers': {'Authorization': _AUTH_HEADERS['Authorization']},
+        'pipeline': pipeline,
+    }))
+    
+    if not response.ok:
+        logger.warning("⚠️  Batch endpoint unavailable (%s), falling back to per-item triggers",
+                       response.status_code)
+        return trigger_batch(companies)
+    
+    # Responses come back in request order
+    run_ids = []
+    for company, item in zip(companies, json_loads(response.content)):
+        if item.get('status') == 200:
+            run_ids.append(json_loads(item['body'])['id'])
+        else:
+            logger.error("Failed to trigger %s: %s - %s",
+                         company.company_name, item.get('status'), item.get('body'))
+    return run_ids
+
+
+def monitor_batch(run_ids: List[str],
+                  max_workers: int = BATCH_MAX_WORKERS) -> None:
+    """Monitor many workflow runs concurrently until they all finish."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(monitor_workflow, run_id): run_id for run_id in run_ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error("Run %s failed: %s", futures[future], e)
+
+
+# =============================================================================
+# ASYNC API (httpx)
+# =============================================================================
+
+def create_async_client() -> 'httpx.AsyncClient':
+    """Create a keep-alive httpx client with the Paperspace auth headers."""
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError('httpx is required for async calls: pip install httpx')
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        timeout=LONG_POLL_WAIT + 5,
+        headers=_AUTH_HEADERS,
+    )
+
+
+async def trigger_ai_pipeline_async(client: 'httpx.AsyncClient',
+                                    company_data: Union[CompanyData, Dict[str, Any]]) -> Dict[str, Any]:
+    """Async version of trigger_ai_pipeline using a shared httpx client."""
+    company = CompanyData.coerce(company_data)
+    workflow_inputs = company.to_workflow_inputs()
+    
+    logger.info("🚀 Triggering AI pipeline for: %s", company.company_name)
+    
+    response = await client.post(
+        PAPERSPACE_API_URL,
+        content=json_dumps({
+            'workflowId': PAPERSPACE_WORKFLOW_ID,
+            'inputs': workflow_inputs,
+        })
+    )
+    
+    if response.is_error:
+        raise Exception(f'Paperspace API error: {response.status_code} - {response.text}')
+    
+    result = json_loads(response.content)
+    logger.info("📊 Run ID: %s", result['id'])
+    return result
+
+
+async def monitor_workflow_async(client: 'httpx.AsyncClient', run_id: str) -> Dict[str, Any]:
+    """Async version of monitor_workflow (long-poll with backoff fallback)."""
+    status_url = _RUN_URL_PREFIX + run_id
+    delay = POLL_INITIAL_DELAY
+    last_status = None
+    long_poll = True
+    since_version = None
+    
+    while True:
+        if long_poll:
+            params = {'wait': LONG_POLL_WAIT}
+            if since_version is not None:
+                params['since_version'] = since_version
+            started = time.monotonic()
+            response = await client.get(status_url, params=params)
+            if response.status_code in (400, 404):
+                long_poll = False
+                response = await client.get(status_url)
+        else:
+            response = await client.get(status_url)
         
-        run = response.json()
+        run = json_loads(response.content)
         
-        print(f"📊 Status: {run['status']}")
+        logger.info("📊 Status (%s): %s", run_id, run['status'])
         
         if run['status'] == 'succeeded':
-            print('✅ Pipeline completed successfully!')
             return run
         elif run['status'] == 'failed':
-            print('❌ Pipeline failed')
             raise Exception('Workflow failed')
         
-        # Wait 30 seconds before checking again
-        time.sleep(30)
+        if long_poll and 'version' in run:
+            answered = _long_poll_answered(run, since_version, time.monotonic() - started)
+            since_version = run['version']
+            if answered:
+                continue
+        else:
+            long_poll = False
+        
+        if run['status'] != last_status:
+            delay = POLL_INITIAL_DELAY
+            last_status = run['status']
+        
+        await asyncio.sleep(min(delay, POLL_MAX_DELAY) + random.uniform(0, 0.5))
+        delay *= POLL_BACKOFF
+
+
+async def run_pipeline_async(client: 'httpx.AsyncClient',
+                             company_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Trigger one pipeline and monitor it to completion."""
+    result = await trigger_ai_pipeline_async(client, company_data)
+    return await monitor_workflow_async(client, result['id'])
+
+
+async def run_batch_async(companies: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Trigger and monitor pipelines for many companies concurrently.
+    
+    Each company's trigger+monitor is fused into one task so a slow trigger
+    never holds back monitoring of runs that already started.
+    
+    Returns:
+        Final run dicts, or the exception raised for each failed company
+    """
+    async with create_async_client() as client:
+        return await asyncio.gather(
+            *(run_pipeline_async(client, company) for company in companies),
+            return_exceptions=True,
+        )
 
 
 # =============================================================================
@@ -147,7 +701,7 @@ def example1_basic():
         'report_expectations': 'Comprehensive AI readiness analysis',
     })
     
-    print(f"Pipeline started: {result['id']}")
+    logger.info("Pipeline started: %s", result['id'])
 
 
 def example2_with_drive():
@@ -161,31 +715,85 @@ def example2_with_drive():
     
     # Monitor until completion
     final_result = monitor_workflow(result['id'])
-    print('Final report ready!')
+    logger.info('Final report ready!')
 
 
-def example3_flask():
-    """Example 3: Integration with Flask backend"""
-    from flask import Flask, request, jsonify
+# Most recent trigger futures kept for /api/status in the Flask example
+TRIGGER_HISTORY_LIMIT = 1000
+
+
+def create_app():
+    """
+    Build the Flask app used by example 3.
+    
+    Run it under a production server so concurrent triggers overlap, e.g.:
+        gunicorn -k gevent -w 4 -b 0.0.0.0:3000 'direct_api_call:create_app()'
+    """
+    from flask import Flask, request
     
     app = Flask(__name__)
     
+    # Background trigger pool, keyed by correlation id; built per app so
+    # plain CLI use never starts it
+    trigger_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+    trigger_futures: Dict[str, Any] = {}
+    futures_lock = threading.Lock()
+    
+    def json_response(payload: Dict[str, Any], status: int = 200):
+        return app.response_class(json_dumps(payload), status=status,
+                                  mimetype='application/json')
+    
     @app.route('/api/trigger-pipeline', methods=['POST'])
     def api_trigger_pipeline():
         try:
-            result = trigger_ai_pipeline(request.json)
-            return jsonify({
-                'success': True,
-                'runId': result['id'],
-                'message': 'Pipeline triggered successfully',
-            })
+            company_data = CompanyData.from_dict(json_loads(request.get_data()))
         except Exception as e:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': str(e),
-            }), 500
+            }, 400)
+        
+        # Trigger off the request thread; the client polls /api/status/<id>
+        correlation_id = uuid.uuid4().hex
+        future = trigger_executor.submit(trigger_ai_pipeline, company_data)
+        with futures_lock:
+            trigger_futures[correlation_id] = future
+            while len(trigger_futures) > TRIGGER_HISTORY_LIMIT:
+                del trigger_futures[next(iter(trigger_futures))]
+        return json_response({
+            'success': True,
+            'correlationId': correlation_id,
+            'message': 'Pipeline trigger accepted',
+        }, 202)
     
-    app.run(port=3000)
+    @app.route('/api/status/<correlation_id>', methods=['GET'])
+    def api_status(correlation_id: str):
+        with futures_lock:
+            future = trigger_futures.get(correlation_id)
+        if future is None:
+            return json_response({'success': False, 'error': 'Unknown correlation id'}, 404)
+        if not future.done():
+            return json_response({'success': True, 'state': 'triggering'})
+        try:
+            run_id = future.result()['id']
+        except Exception as e:
+            return json_response({'success': False, 'state': 'trigger_failed', 'error': str(e)}, 500)
+        
+        status_url = _RUN_URL_PREFIX + run_id
+        _, run = _fetch_run(run_id, status_url)
+        return json_response({
+            'success': True,
+            'state': 'triggered',
+            'runId': run_id,
+            'status': run.get('status'),
+        })
+    
+    return app
+
+
+def example3_flask():
+    """Example 3: Integration with Flask backend (dev server; see create_app)"""
+    create_app().run(port=3000, threaded=True)
 
 
 def example4_batch():
@@ -196,20 +804,29 @@ def example4_batch():
         {'company_name': 'Company C', 'use_cases_count': 10},
     ]
     
-    run_ids = []
-    for company in companies:
-        result = trigger_ai_pipeline(company)
-        run_ids.append(result['id'])
-        time.sleep(5)  # Rate limiting
+    run_ids = trigger_ai_pipeline_batch(companies)
     
-    print(f"Started {len(run_ids)} pipelines")
+    logger.info("Started %d pipelines", len(run_ids))
     
     # Monitor all
-    for run_id in run_ids:
-        try:
-            monitor_workflow(run_id)
-        except Exception as e:
-            print(f"Run {run_id} failed: {e}")
+    monitor_batch(run_ids)
+
+
+def example5_batch_async():
+    """Example 5: Process multiple companies with asyncio + httpx"""
+    companies = [
+        {'company_name': 'Company A', 'use_cases_count': 5},
+        {'company_name': 'Company B', 'use_cases_count': 7},
+        {'company_name': 'Company C', 'use_cases_count': 10},
+    ]
+    
+    results = asyncio.run(run_batch_async(companies))
+    
+    for company, outcome in zip(companies, results):
+        if isinstance(outcome, Exception):
+            logger.error("%s failed: %s", company['company_name'], outcome)
+        else:
+            logger.info("%s completed: %s", company['company_name'], outcome['id'])
 
 
 # =============================================================================
@@ -220,27 +837,47 @@ if __name__ == '__main__':
     import argparse
     
     parser = argparse.ArgumentParser(description='Trigger AI pipeline via Paperspace API')
-    parser.add_argument('company_name', help='Company name')
+    parser.add_argument('company_name', nargs='?', help='Company name (omit with --batch-file)')
     parser.add_argument('--description', help='Company description', default='')
     parser.add_argument('--use-cases', type=int, help='Number of use cases', default=7)
     parser.add_argument('--score', type=int, help='Readiness score', default=50)
     parser.add_argument('--category', help='Readiness category', default='Explorer')
     parser.add_argument('--drive-link', help='Google Drive link', default='')
     parser.add_argument('--monitor', action='store_true', help='Monitor until completion')
+    parser.add_argument('--verbose', action='store_true', help='Log workflow inputs and other debug output')
+    parser.add_argument('--batch-file', type=argparse.FileType('r'),
+                        help='JSON array of company objects to trigger in one run')
+    parser.add_argument('--concurrency', type=int, default=BATCH_MAX_WORKERS,
+                        help='Worker threads for --batch-file')
     
     args = parser.parse_args()
+    if not args.company_name and not args.batch_file:
+        parser.error('company_name or --batch-file is required')
+    listener = setup_logging(logging.DEBUG if args.verbose else logging.INFO)
     
-    # Trigger pipeline
-    result = trigger_ai_pipeline({
-        'company_name': args.company_name,
-        'company_description': args.description,
-        'use_cases_count': args.use_cases,
-        'readiness_score': args.score,
-        'readiness_category': args.category,
-        'google_drive_link': args.drive_link,
-    })
-    
-    # Monitor if requested
-    if args.monitor:
-        monitor_workflow(result['id'])
-
+    try:
+        if args.batch_file:
+            # Bulk mode: one process and one pooled connection for the whole batch
+            with args.batch_file:
+                companies = json_loads(args.batch_file.read())
+            run_ids = trigger_batch(companies, max_workers=args.concurrency)
+            logger.info("Started %d/%d pipelines", len(run_ids), len(companies))
+            
+            if args.monitor:
+                monitor_batch(run_ids, max_workers=args.concurrency)
+        else:
+            # Trigger pipeline
+            result = trigger_ai_pipeline({
+                'company_name': args.company_name,
+                'company_description': args.description,
+                'use_cases_count': args.use_cases,
+                'readiness_score': args.score,
+                'readiness_category': args.category,
+                'google_drive_link': args.drive_link,
+            })
+            
+            # Monitor if requested
+            if args.monitor:
+                monitor_workflow(result['id'])
+    finally:
+        listener.stop()
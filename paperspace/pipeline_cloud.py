@@ -12,10 +12,17 @@ import os
 import sys
 import time
 import re
+import runpy
+import shlex
 import subprocess
 import asyncio
+import codecs
+import hashlib
+import socket
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 import json
 
 # Add parent directory to path
@@ -26,11 +33,11 @@ if ROOT_DIR not in sys.path:
 # Import cloud utilities
 from paperspace.utils.cloud_logging import create_logger
 from paperspace.utils.cloud_storage import CloudStorage
+from paperspace.utils.csv_convert import convert_csv_to_json, is_converted
+from paperspace.utils.gdrive import extract_google_id, get_drive_service
 
 # Optional Google Drive API for final report upload
 try:
-    from google.oauth2.service_account import Credentials as GCredentials
-    from googleapiclient.discovery import build as gbuild
     from googleapiclient.http import MediaFileUpload
     GOOGLE_API_AVAILABLE = True
 except Exception as _ga_err:
@@ -43,6 +50,111 @@ GDRIVE_FINAL_REPORT_FOLDER = os.environ.get(
     "https://drive.google.com/drive/folders/17mklV-Pz7Jqv1ZQiDNvYOvNA6qXzROXF",
 )
 
+# MCP server readiness polling
+MCP_READY_TIMEOUT = 10.0
+MCP_READY_INTERVAL = 0.1
+
+# Resumable upload chunk size (must be a multiple of 256KB)
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Run sequential stage scripts inside this interpreter instead of spawning python3
+IN_PROCESS_STAGES = os.environ.get("PIPELINE_IN_PROCESS_STAGES") == "1"
+
+# In-process stages swap the process-wide sys.argv/sys.path/sys.modules: one at a time
+_IN_PROCESS_STAGE_LOCK = threading.Lock()
+
+
+# Company info fields, keyed by the CloudPipeline attribute they populate
+_COMPANY_PATTERNS = {
+    "company_description": re.compile(r'\{Company description\}:\s*(.+?)(?=\n\{|\n$)', re.DOTALL),
+    "readiness_score": re.compile(r'\{Overall Readiness score\}:\s*(.+?)(?=\n\{|\n$)', re.DOTALL),
+    "readiness_category": re.compile(r'\{Agent-readiness category\}:\s*(.+?)(?=\n\{|\n$)', re.DOTALL),
+    "report_expectations": re.compile(r'\{Report Expectations\}:\s*(.+?)(?=\n\{|\n$)', re.DOTALL),
+}
+
+# Parsed company info by content hash, reused across pipeline instances
+_PARSE_CACHE: Dict[bytes, Dict[str, str]] = {}
+
+
+# Consolidation outputs that can become the final report
+FINAL_REPORT_PREFIXES = (
+    "final_dual_model_report_",
+    "final_responses_patched_report_",
+    "final_consolidated_report_",
+)
+
+
+def _latest_file(directory: Path, prefixes: tuple, suffix: str) -> Optional[Path]:
+    """Newest file in directory matching prefix/suffix, in one scandir pass."""
+    latest = None
+    best_mtime = -1.0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefixes) and entry.name.endswith(suffix):
+                    mtime = entry.stat().st_mtime
+                    if mtime > best_mtime:
+                        best_mtime = mtime
+                        latest = entry.path
+    except FileNotFoundError:
+        return None
+    return Path(latest) if latest else None
+
+
+# Linux-only fcntl command to resize a pipe's kernel buffer
+F_SETPIPE_SZ = 1031
+PIPE_BUFFER_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 65536
+
+# Lines of command output kept for callers; older lines are dropped
+OUTPUT_TAIL_LINES = 10000
+
+# Vector store IDs printed by helper_vectorstoreupload.py
+_VS_RE = re.compile(r"vs_[a-zA-Z0-9]+")
+
+
+def _grow_pipe_buffer(stream) -> None:
+    """Enlarge the child's stdout pipe so bursts of output don't block it."""
+    try:
+        import fcntl
+        fcntl.fcntl(stream.fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except (ImportError, OSError):
+        pass
+
+
+def _pump_output(stream, tail: deque, found_ids: list) -> None:
+    """Drain a subprocess pipe in large blocks, echoing complete lines.
+
+    Only the last tail.maxlen lines are kept; vector store IDs are
+    collected as lines arrive so the full output never has to be held.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    fd = stream.fileno()
+    buf = ""
+    while True:
+        chunk = os.read(fd, READ_CHUNK_SIZE)
+        buf += decoder.decode(chunk, final=not chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                # Log to console (captured by Paperspace)
+                print(line, flush=True)
+                _collect_line(line, tail, found_ids)
+        if not chunk:
+            break
+    line = buf.rstrip()
+    if line:
+        print(line, flush=True)
+        _collect_line(line, tail, found_ids)
+
+
+def _collect_line(line: str, tail: deque, found_ids: list) -> None:
+    tail.append(line)
+    match = _VS_RE.search(line)
+    if match:
+        found_ids.append(match.group(0))
+
 
 class CloudPipeline:
     """Cloud-compatible AI pipeline runner."""
@@ -77,26 +189,19 @@ class CloudPipeline:
         if not self.company_info:
             return
         
-        # Parse from formatted string
-        patterns = {
-            "description": r'\{Company description\}:\s*(.+?)(?=\n\{|\n$)',
-            "score": r'\{Overall Readiness score\}:\s*(.+?)(?=\n\{|\n$)',
-            "category": r'\{Agent-readiness category\}:\s*(.+?)(?=\n\{|\n$)',
-            "expectations": r'\{Report Expectations\}:\s*(.+?)(?=\n\{|\n$)',
-        }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, self.company_info, re.DOTALL)
-            if match:
-                value = match.group(1).strip()
-                if key == "description":
-                    self.company_description = value
-                elif key == "score":
-                    self.readiness_score = value
-                elif key == "category":
-                    self.readiness_category = value
-                elif key == "expectations":
-                    self.report_expectations = value
+        # Same company info string always parses the same way
+        key = hashlib.sha1(self.company_info.encode("utf-8")).digest()
+        parsed = _PARSE_CACHE.get(key)
+        if parsed is None:
+            parsed = {}
+            for attr, pattern in _COMPANY_PATTERNS.items():
+                match = pattern.search(self.company_info)
+                if match:
+                    parsed[attr] = match.group(1).strip()
+            _PARSE_CACHE[key] = parsed
+        
+        for attr, value in parsed.items():
+            setattr(self, attr, value)
     
     def setup_environment(self):
         """Set up environment variables for the pipeline."""
@@ -118,47 +223,116 @@ class CloudPipeline:
         os.environ["DISABLE_CAFFEINATE"] = "1"
         os.environ["DISABLE_TERMINAL_SPAWN"] = "1"
         
+        # Snapshot once; every child process reuses this dict
+        self._child_env = os.environ.copy()
+        
         self.logger.info("Environment variables configured")
     
-    def run_command(self, cmd: str, cwd: Optional[str] = None, 
-                   timeout: int = 3600) -> tuple[int, str]:
-        """Run a command and return exit code and output."""
-        self.logger.info(f"Executing: {cmd}")
+    def set_env(self, key: str, value: str):
+        """Set a variable for this process and all later child processes."""
+        os.environ[key] = value
+        self._child_env[key] = value
+    
+    def run_command(self, cmd: Union[str, List[str]], cwd: Optional[str] = None, 
+                   timeout: int = 3600) -> tuple[int, str, List[str]]:
+        """
+        Run a command (argv list, or a string split with shlex).
+        
+        Returns:
+            (exit code, last OUTPUT_TAIL_LINES lines of output, vs_ IDs seen in the output)
+        """
+        args = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+        self.logger.info(f"Executing: {shlex.join(args)}")
         
         try:
+            # Exec directly (no /bin/sh) so a timeout kill hits the real child
             process = subprocess.Popen(
-                cmd,
-                shell=True,
+                args,
                 cwd=cwd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                env=os.environ,
+                bufsize=-1,
+                env=dict(self._child_env),  # own copy: set_env may run on another thread
             )
+            _grow_pipe_buffer(process.stdout)
             
-            output_lines = []
-            for line in iter(process.stdout.readline, ''):
-                line = line.rstrip()
-                if line:
-                    # Log to console (captured by Paperspace)
-                    print(line, flush=True)
-                    output_lines.append(line)
+            # Drain output on a background thread so wait() can enforce the timeout
+            tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            found_ids = []
+            pump = threading.Thread(
+                target=_pump_output, args=(process.stdout, tail, found_ids), daemon=True
+            )
+            pump.start()
             
-            process.stdout.close()
             exit_code = process.wait(timeout=timeout)
+            pump.join()
+            process.stdout.close()
             
-            full_output = '\n'.join(output_lines)
-            return exit_code, full_output
+            return exit_code, '\n'.join(tail), found_ids
             
         except subprocess.TimeoutExpired:
             process.kill()
+            pump.join(timeout=5)
             self.logger.error(f"Command timed out after {timeout} seconds")
-            return 1, "TIMEOUT"
+            return 1, "TIMEOUT", []
         except Exception as e:
             self.logger.error(f"Command failed: {e}")
-            return 1, str(e)
+            return 1, str(e), []
+    
+    def run_stage(self, script: str, args: List[str] = (),
+                  timeout: int = 3600) -> tuple[int, str, List[str]]:
+        """
+        Run a stage script, in-process when IN_PROCESS_STAGES is set.
+        
+        In-process runs reuse this interpreter's third-party imports (openai,
+        etc.) via runpy with __name__ == "__main__". The script runs on its own
+        thread, so it has no running event loop and may call asyncio.run(), and
+        modules imported from the script's directory are dropped afterwards so
+        no state leaks into the next stage. Stages called concurrently are
+        serialized on _IN_PROCESS_STAGE_LOCK, since they share those globals.
+        Output goes straight to the console and is not captured, and the
+        timeout is not enforced, so only use this for stages whose output the
+        caller doesn't inspect.
+        """
+        argv = [script, *args]
+        if not IN_PROCESS_STAGES:
+            return self.run_command(["python3", "-u", *argv], timeout=timeout)
+        
+        self.logger.info(f"Executing in-process: {shlex.join(argv)}")
+        script_dir = os.path.dirname(os.path.abspath(script))
+        result = {"exit_code": 1}
+        
+        def target():
+            try:
+                runpy.run_path(script, run_name="__main__")
+                result["exit_code"] = 0
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    result["exit_code"] = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+            except Exception as e:
+                self.logger.error(f"Stage failed: {e}")
+        
+        with _IN_PROCESS_STAGE_LOCK:
+            saved_argv, saved_path = sys.argv, sys.path[:]
+            saved_modules = set(sys.modules)
+            # Match `python3 script.py`: argv and the script's directory on sys.path
+            sys.argv = argv
+            sys.path.insert(0, script_dir)
+            try:
+                stage_thread = threading.Thread(target=target, name=f"stage:{os.path.basename(script)}")
+                stage_thread.start()
+                stage_thread.join()
+            finally:
+                sys.argv, sys.path[:] = saved_argv, saved_path
+                # Forget the stage's own helper modules; keep third-party imports cached
+                for name in set(sys.modules) - saved_modules:
+                    module_file = getattr(sys.modules.get(name), "__file__", None) or ""
+                    if module_file.startswith(script_dir + os.sep):
+                        del sys.modules[name]
+                sys.stdout.flush()
+        return result["exit_code"], "", []
     
     def preprocess_company_folder(self) -> bool:
         """Preprocess company folder (e.g., convert CSV to JSON)."""
@@ -170,12 +344,15 @@ class CloudPipeline:
         csv_files = list(company_dir.glob('*.csv'))
         for csv_path in csv_files:
             json_path = csv_path.with_suffix('.json')
+            if is_converted(csv_path, json_path):
+                # The newer JSON may be a user upload rather than our output:
+                # keep the CSV, it is only removed after this run converts it
+                self.logger.info(f"Skipping {csv_path.name} (JSON up to date; CSV kept)")
+                continue
             self.logger.info(f"Converting CSV: {csv_path.name}")
             
             try:
-                import pandas as pd
-                df = pd.read_csv(csv_path)
-                df.to_json(json_path, orient='records', indent=2)
+                convert_csv_to_json(csv_path, json_path)
                 csv_path.unlink()
                 self.logger.success(f"Converted {csv_path.name} to JSON")
             except Exception as e:
@@ -189,8 +366,8 @@ class CloudPipeline:
         
         company_folder = str(self.storage.get_company_data_dir())
         
-        exit_code, output = self.run_command(
-            f"python3 helper_vectorstoreupload.py \"{company_folder}\""
+        exit_code, _, found_ids = self.run_command(
+            ["python3", "helper_vectorstoreupload.py", company_folder]
         )
         
         if exit_code != 0:
@@ -200,10 +377,9 @@ class CloudPipeline:
         # Get the vector store ID
         vector_store_id = self.storage.get_latest_vector_store_id()
         if not vector_store_id:
-            # Try to extract from output
-            match = re.search(r'vs_[a-zA-Z0-9]+', output)
-            if match:
-                vector_store_id = match.group(0)
+            # Fall back to the last ID printed by the upload script
+            if found_ids:
+                vector_store_id = found_ids[-1]
                 self.storage.save_vector_store_id(vector_store_id)
         
         if vector_store_id:
@@ -221,19 +397,35 @@ class CloudPipeline:
         # No need for ngrok - Paperspace handles routing
         
         port = int(os.environ.get("MCP_PORT", "8001"))
-        vector_arg = f" --vector-store-id {vector_store_id}" if vector_store_id else ""
-        
-        cmd = f"python3 minimal_mcp.py --port {port}{vector_arg} &"
+        cmd = ["python3", "minimal_mcp.py", "--port", str(port)]
+        if vector_store_id:
+            cmd += ["--vector-store-id", vector_store_id]
         
         try:
-            subprocess.Popen(cmd, shell=True, env=os.environ)
-            time.sleep(5)  # Give server time to start
+            # Popen already returns immediately; no shell/& needed to background it
+            subprocess.Popen(cmd, env=dict(self._child_env))
+            
+            # Wait until the port accepts connections instead of a fixed sleep
+            start = time.monotonic()
+            deadline = start + MCP_READY_TIMEOUT
+            ready = False
+            while time.monotonic() < deadline:
+                try:
+                    socket.create_connection(("localhost", port), timeout=MCP_READY_INTERVAL).close()
+                    ready = True
+                    break
+                except OSError:
+                    time.sleep(MCP_READY_INTERVAL)
+            
+            self.logger.metric("mcp_startup_wait", round(time.monotonic() - start, 2), "s")
+            if not ready:
+                self.logger.warning(f"MCP server not accepting connections after {MCP_READY_TIMEOUT:.0f}s")
             self.logger.success(f"MCP server started on port {port}")
             
             # In Paperspace, the MCP URL would be provided by the platform
             # For now, use localhost (within the same container/pod)
             mcp_url = f"http://localhost:{port}/sse"
-            os.environ["VECTOR_STORE_MCP_URL"] = mcp_url
+            self.set_env("VECTOR_STORE_MCP_URL", mcp_url)
             self.logger.info(f"MCP URL: {mcp_url}")
             
             return True
@@ -246,10 +438,12 @@ class CloudPipeline:
         self.logger.step(4, 10, "Extracting and clustering quotes")
         
         collection_name = f"{self.company_name}_quotes"
-        os.environ["QDRANT_COLLECTION"] = collection_name
+        # run() sets this before starting the concurrent branches
+        if self._child_env.get("QDRANT_COLLECTION") != collection_name:
+            self.set_env("QDRANT_COLLECTION", collection_name)
         
-        exit_code, output = self.run_command(
-            f"python3 pre-prep/step1.py --force --company-name \"{self.company_name}\""
+        exit_code, output, _ = self.run_command(
+            ["python3", "pre-prep/step1.py", "--force", "--company-name", self.company_name]
         )
         
         if exit_code != 0:
@@ -266,8 +460,8 @@ class CloudPipeline:
         # Update config if needed
         # For cloud, configs are typically env vars or mounted files
         
-        exit_code, output = self.run_command(
-            "python3 part_a/minimal_dr_part_a.py",
+        exit_code, output, _ = self.run_command(
+            ["python3", "part_a/minimal_dr_part_a.py"],
             timeout=7200  # 2 hours
         )
         
@@ -296,8 +490,8 @@ class CloudPipeline:
                 self.logger.warning(f"Retry {attempt}/{max_retries}")
                 time.sleep(180)  # Wait 3 minutes
             
-            exit_code, output = self.run_command(
-                "python3 part_b/minimal_dr_part_b.py",
+            exit_code, output, _ = self.run_command(
+                ["python3", "part_b/minimal_dr_part_b.py"],
                 timeout=7200
             )
             
@@ -317,7 +511,7 @@ class CloudPipeline:
         
         # Run use cases processing
         self.logger.step(6.5, 10, "Processing use cases")
-        exit_code, output = self.run_command("python3 -u part_b/usecases_apicalls.py")
+        exit_code, output, _ = self.run_stage("part_b/usecases_apicalls.py")
         
         if exit_code != 0:
             self.logger.error("Use cases processing failed")
@@ -328,16 +522,14 @@ class CloudPipeline:
         
         # Find latest use cases report
         use_cased_dir = self.storage.part_b_dir
-        candidates = list(use_cased_dir.glob(f"report_with_processed_use_cases_*.md"))
-        if candidates:
-            candidates.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            input_report = candidates[0]
-            
+        input_report = _latest_file(use_cased_dir, ("report_with_processed_use_cases_",), ".md")
+        if input_report:
             timestamp = time.strftime("%Y%m%d-%H%M%S")
             output_report = self.storage.part_b_dir / f"report_{self.storage.company_slug}_{timestamp}_enhanced.md"
             
-            exit_code, output = self.run_command(
-                f"python3 -u part_b/main2_refactored.py --input {input_report} --output {output_report}"
+            exit_code, output, _ = self.run_stage(
+                "part_b/main2_refactored.py",
+                ["--input", str(input_report), "--output", str(output_report)],
             )
             
             if exit_code != 0:
@@ -351,8 +543,9 @@ class CloudPipeline:
         """Run final consolidation."""
         self.logger.step(7, 10, "Running final consolidation")
         
-        exit_code, output = self.run_command(
-            "python3 -u final_consolidation/main.py dual-model --content-model gpt-5 --style-model gpt-5-nano",
+        exit_code, output, _ = self.run_command(
+            ["python3", "-u", "final_consolidation/main.py", "dual-model",
+             "--content-model", "gpt-5", "--style-model", "gpt-5-nano"],
             timeout=7200
         )
         
@@ -377,16 +570,18 @@ class CloudPipeline:
                 self.logger.warning(f"Credentials not found: {creds_path}")
                 return False
             
-            scopes = ["https://www.googleapis.com/auth/drive"]
-            creds = GCredentials.from_service_account_file(str(creds_path), scopes=scopes)
-            service = gbuild("drive", "v3", credentials=creds)
+            service = get_drive_service(str(creds_path))
             
             # Extract folder ID
-            folder_id_match = re.search(r"/folders/([a-zA-Z0-9_-]+)", GDRIVE_FINAL_REPORT_FOLDER)
-            folder_id = folder_id_match.group(1) if folder_id_match else GDRIVE_FINAL_REPORT_FOLDER
+            folder_id = extract_google_id(GDRIVE_FINAL_REPORT_FOLDER) or GDRIVE_FINAL_REPORT_FOLDER
             
             # Upload file
-            media = MediaFileUpload(str(report_path), resumable=True)
+            media = MediaFileUpload(
+                str(report_path),
+                mimetype="text/markdown",
+                resumable=True,
+                chunksize=UPLOAD_CHUNK_SIZE,
+            )
             body = {"name": report_path.name, "parents": [folder_id]}
             
             request = service.files().create(
@@ -397,10 +592,14 @@ class CloudPipeline:
             )
             
             response = None
+            last_logged = -10
             while response is None:
                 status, response = request.next_chunk()
                 if status:
-                    self.logger.metric("upload_progress", int(status.progress() * 100), "%")
+                    progress = int(status.progress() * 100)
+                    if progress - last_logged >= 10:
+                        self.logger.metric("upload_progress", progress, "%")
+                        last_logged = progress
             
             if response and response.get("id"):
                 self.logger.success(f"Uploaded to Drive: {response.get('name')}")
@@ -417,23 +616,16 @@ class CloudPipeline:
         self.logger.step(9, 10, "Finalizing report")
         
         # Find the latest final report
-        final_candidates = []
-        final_candidates.extend(self.storage.final_dir.glob("final_dual_model_report_*.md"))
-        final_candidates.extend(self.storage.final_dir.glob("final_responses_patched_report_*.md"))
-        final_candidates.extend(self.storage.final_dir.glob("final_consolidated_report_*.md"))
+        latest_report = _latest_file(self.storage.final_dir, FINAL_REPORT_PREFIXES, ".md")
         
-        if not final_candidates:
+        if not latest_report:
             self.logger.error("No final report found")
             return None
         
-        final_candidates.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        latest_report = final_candidates[0]
-        
         # Copy to final location
-        content = latest_report.read_text(encoding='utf-8')
-        final_path = self.storage.save_final_report(content)
+        final_path = self.storage.save_final_report_path(latest_report)
         
-        self.logger.metric("final_report_size", len(content), "chars")
+        self.logger.metric("final_report_bytes", final_path.stat().st_size, "bytes")
         self.logger.success(f"Final report saved: {final_path.name}")
         
         # Upload to Google Drive
@@ -454,18 +646,26 @@ class CloudPipeline:
             if not self.preprocess_company_folder():
                 return False
             
-            # Step 2: Upload to vector store
-            vector_store_id = self.upload_to_vector_store()
-            if not vector_store_id:
-                self.logger.warning("Continuing without vector store ID")
-            
-            # Step 3: Start MCP server
-            if not self.start_mcp_server(vector_store_id):
-                return False
-            
-            # Step 4: Quotes extraction
+            # Steps 2-4: the vector store -> MCP server chain and quotes
+            # extraction don't depend on each other, so run them concurrently
+            async def vector_store_and_mcp():
+                # Step 2: Upload to vector store
+                vector_store_id = await asyncio.to_thread(self.upload_to_vector_store)
+                if not vector_store_id:
+                    self.logger.warning("Continuing without vector store ID")
+                
+                # Step 3: Start MCP server
+                mcp_started = await asyncio.to_thread(self.start_mcp_server, vector_store_id)
+                return vector_store_id, mcp_started
+            
+            # Step 4: Quotes extraction (env set here, before the threads start)
             collection_name = f"{self.company_name}_quotes"
-            if not self.run_quotes_extraction():
+            self.set_env("QDRANT_COLLECTION", collection_name)
+            (vector_store_id, mcp_started), quotes_ok = await asyncio.gather(
+                vector_store_and_mcp(),
+                asyncio.to_thread(self.run_quotes_extraction),
+            )
+            if not mcp_started or not quotes_ok:
                 return False
             
             # Step 5: Part A
@@ -6,32 +6,52 @@ Download files from Google Drive using service account.
 import argparse
 import io
 import os
-import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+ROOT_DIR = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
-def extract_google_id(url: str) -> str:
-    """Extract Google Drive file/folder ID."""
-    if not url:
-        return ""
-    m = re.search(r"/folders/([a-zA-Z0-9_-]+)", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"/file/d/([a-zA-Z0-9_-]+)", url)
-    if m:
-        return m.group(1)
-    return ""
+from paperspace.utils.gdrive import (
+    DRIVE_READONLY_SCOPE,
+    extract_google_id,
+    get_drive_credentials,
+    get_drive_service,
+)
+
+# Concurrent file downloads per folder tree
+DOWNLOAD_WORKERS = 8
+
+# Bytes per media request; each chunk is buffered in memory per worker
+DOWNLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+
+# Drive's maximum page size for files.list
+LIST_PAGE_SIZE = 1000
+
+
+def _unique_name(name: str, seen: set) -> str:
+    """name, or name_<n> before the extension if already in seen; records the result."""
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while name in seen:
+        name = f"{stem}_{n}{ext}"
+        n += 1
+    seen.add(name)
+    return name
 
 
 def download_gdrive(url: str, output_dir: Path):
     """Download from Google Drive."""
     try:
-        from google.oauth2.service_account import Credentials
-        from googleapiclient.discovery import build
         from googleapiclient.http import MediaIoBaseDownload
+        from google_auth_httplib2 import AuthorizedHttp
+        import httplib2
     except ImportError:
         print("ERROR: Google API libraries not installed")
-        print("Install with: pip install google-api-python-client google-auth")
+        print("Install with: pip install google-api-python-client google-auth google-auth-httplib2")
         return False
     
     creds_path = Path(os.environ.get("GDRIVE_CREDENTIALS_PATH", "google_drive_credentials.json"))
@@ -39,9 +59,9 @@ def download_gdrive(url: str, output_dir: Path):
         print(f"ERROR: Credentials not found: {creds_path}")
         return False
     
-    scopes = ["https://www.googleapis.com/auth/drive.readonly"]
-    creds = Credentials.from_service_account_file(str(creds_path), scopes=scopes)
-    service = build("drive", "v3", credentials=creds)
+    scopes = (DRIVE_READONLY_SCOPE,)
+    creds = get_drive_credentials(str(creds_path), scopes)
+    service = get_drive_service(str(creds_path), scopes)
     
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -53,56 +73,68 @@ def download_gdrive(url: str, output_dir: Path):
     
     print(f"Downloading from Google Drive: {drive_id}")
     
-    downloaded_count = 0
+    # httplib2 connections are not thread-safe: give each worker its own
+    thread_local = threading.local()
+    
+    def thread_http():
+        if not hasattr(thread_local, "http"):
+            thread_local.http = AuthorizedHttp(creds, http=httplib2.Http())
+        return thread_local.http
     
     def download_file(file_id: str, file_name: str, out_dir: Path) -> bool:
-        nonlocal downloaded_count
         try:
             request = service.files().get_media(fileId=file_id)
+            request.http = thread_http()
             out_path = out_dir / file_name
-            fh = io.FileIO(str(out_path), mode="wb")
-            downloader = MediaIoBaseDownload(fh, request, chunksize=1024 * 1024)
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
+            with io.FileIO(str(out_path), mode="wb") as fh:
+                downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+                done = False
+                while not done:
+                    status, done = downloader.next_chunk()
             print(f"✓ Downloaded: {file_name}")
-            downloaded_count += 1
             return True
         except Exception as e:
             print(f"✗ Failed to download {file_name}: {e}")
             return False
     
-    def download_folder(folder_id: str, out_dir: Path):
-        nonlocal downloaded_count
+    def list_page(folder_id: str, page_token):
+        return service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields="nextPageToken, files(id, name, mimeType)",
+            pageSize=LIST_PAGE_SIZE,
+            pageToken=page_token,
+        ).execute(http=thread_http())
+    
+    def download_folder(folder_id: str, out_dir: Path, executor: ThreadPoolExecutor,
+                        futures: list, lister: ThreadPoolExecutor):
+        """Walk folders in this thread; queue file downloads on the pool."""
         out_dir.mkdir(parents=True, exist_ok=True)
-        page_token = None
+        pending = lister.submit(list_page, folder_id, None)
+        # Drive allows duplicate names in a folder; parallel writers need distinct paths
+        seen = set()
         
-        while True:
+        while pending:
             try:
-                resp = service.files().list(
-                    q=f"'{folder_id}' in parents and trashed=false",
-                    fields="nextPageToken, files(id, name, mimeType)",
-                    pageToken=page_token,
-                ).execute()
+                resp = pending.result()
             except Exception as e:
                 print(f"✗ Failed to list folder: {e}")
                 break
             
+            # Fetch the next page while this one is being queued
+            page_token = resp.get("nextPageToken")
+            pending = lister.submit(list_page, folder_id, page_token) if page_token else None
+            
             for item in resp.get("files", []):
                 item_id = item.get("id")
                 name = item.get("name") or item_id
                 mime = item.get("mimeType") or ""
                 
                 if mime == "application/vnd.google-apps.folder":
-                    download_folder(item_id, out_dir / name)
+                    download_folder(item_id, out_dir / _unique_name(name, seen), executor, futures, lister)
                 elif mime.startswith("application/vnd.google-apps"):
                     print(f"⊘ Skipping Google Docs type: {name}")
                 else:
-                    download_file(item_id, name, out_dir)
-            
-            page_token = resp.get("nextPageToken")
-            if not page_token:
-                break
+                    futures.append(executor.submit(download_file, item_id, _unique_name(name, seen), out_dir))
     
     # Get metadata
     try:
@@ -111,13 +143,22 @@ def download_gdrive(url: str, output_dir: Path):
         print(f"ERROR: Failed to get metadata: {e}")
         return False
     
+    downloaded_count = 0
     mime = meta.get("mimeType", "")
     if mime == "application/vnd.google-apps.folder":
         print(f"Folder: {meta.get('name')}")
-        download_folder(drive_id, output_dir)
+        futures = []
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor, \
+                ThreadPoolExecutor(max_workers=1) as lister:
+            download_folder(drive_id, output_dir, executor, futures, lister)
+            for i, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    downloaded_count += 1
+                print(f"  [{i}/{len(futures)}] files processed")
     else:
         fname = meta.get("name") or f"download_{drive_id}"
-        download_file(drive_id, fname, output_dir)
+        if download_file(drive_id, fname, output_dir):
+            downloaded_count += 1
     
     print(f"\nDownload complete: {downloaded_count} file(s)")
     return True
@@ -4,11 +4,41 @@ Preprocess company data (e.g., convert CSV to JSON).
 """
 
 import argparse
+import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 
+# Add repo root to path for imports
+ROOT_DIR = os.path.abspath(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
-def preprocess_folder(input_dir: Path, output_dir: Path):
+from paperspace.utils.csv_convert import ENGINES, convert_csv_to_json, is_converted
+
+
+def _is_unchanged_copy(src_stat: os.stat_result, dest: Path) -> bool:
+    """True if dest already holds a copy of a file with this stat."""
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        return False
+    return (dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+            and dest_stat.st_size == src_stat.st_size)
+
+
+def _convert_one(csv_path: Path, json_path: Path, engine: str) -> tuple[str, Optional[str]]:
+    """Worker-process entry point: convert one CSV, returning (name, error)."""
+    try:
+        convert_csv_to_json(csv_path, json_path, engine=engine)
+        return csv_path.name, None
+    except Exception as e:
+        return csv_path.name, str(e)
+
+
+def preprocess_folder(input_dir: Path, output_dir: Path, engine: str = "stdlib"):
     """Preprocess data files in a folder."""
     print(f"Preprocessing: {input_dir}")
     
@@ -16,34 +46,51 @@ def preprocess_folder(input_dir: Path, output_dir: Path):
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Convert CSV files to JSON
-    csv_files = list(input_dir.glob('*.csv'))
+    # Convert CSV files to JSON, skipping ones whose JSON is already current
+    csv_files = []
+    for csv_path in input_dir.glob('*.csv'):
+        if is_converted(csv_path, output_dir / csv_path.with_suffix('.json').name):
+            print(f"⊘ Up to date, skipping {csv_path.name}")
+        else:
+            csv_files.append(csv_path)
     
     if csv_files:
-        try:
-            import pandas as pd
-        except ImportError:
-            print("ERROR: pandas not installed. Install with: pip install pandas")
-            sys.exit(1)
+        if engine == "pandas":
+            try:
+                import pandas  # noqa: F401
+            except ImportError:
+                print("ERROR: pandas not installed. Install with: pip install pandas")
+                sys.exit(1)
         
-        for csv_path in csv_files:
-            json_path = output_dir / csv_path.with_suffix('.json').name
-            print(f"Converting: {csv_path.name} -> {json_path.name}")
+        # Each CSV is independent and CPU-bound: convert them in parallel
+        workers = min(len(csv_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for csv_path in csv_files:
+                json_path = output_dir / csv_path.with_suffix('.json').name
+                print(f"Converting: {csv_path.name} -> {json_path.name}")
+                futures.append(executor.submit(_convert_one, csv_path, json_path, engine))
             
-            try:
-                df = pd.read_csv(csv_path)
-                df.to_json(json_path, orient='records', indent=2)
-                print(f"✓ Converted {csv_path.name}")
-            except Exception as e:
-                print(f"✗ Failed to convert {csv_path.name}: {e}")
+            for future in as_completed(futures):
+                name, error = future.result()
+                if error:
+                    print(f"✗ Failed to convert {name}: {error}")
+                else:
+                    print(f"✓ Converted {name}")
     
     # Copy other supported files
     for ext in ['.txt', '.pdf', '.docx', '.md', '.json']:
         for file_path in input_dir.glob(f'*{ext}'):
             dest = output_dir / file_path.name
             if dest != file_path:  # Don't copy to itself
-                import shutil
-                shutil.copy2(file_path, dest)
+                src_stat = file_path.stat()
+                if _is_unchanged_copy(src_stat, dest):
+                    print(f"⊘ Unchanged, skipping {file_path.name}")
+                    continue
+                # copyfile uses sendfile on Linux and skips copy2's metadata pass;
+                # carry over mtime only so the unchanged check works next run
+                shutil.copyfile(file_path, dest)
+                os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
                 print(f"✓ Copied {file_path.name}")
     
     print("Preprocessing complete")
@@ -53,9 +100,11 @@ def main():
     parser = argparse.ArgumentParser(description="Preprocess company data")
     parser.add_argument("--input", required=True, help="Input directory")
     parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--engine", choices=ENGINES, default="stdlib",
+                        help="CSV conversion engine (pandas infers column types)")
     
     args = parser.parse_args()
-    preprocess_folder(Path(args.input), Path(args.output))
+    preprocess_folder(Path(args.input), Path(args.output), engine=args.engine)
 
 
 if __name__ == "__main__":
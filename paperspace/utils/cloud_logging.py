@@ -4,12 +4,61 @@ Structured logging for Paperspace Workflows.
 Logs are written to stdout in JSON format for easy parsing and monitoring.
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import json
+import os
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from datetime import date, datetime
 from typing import Any, Dict, Optional
-from pathlib import Path
+from pathlib import Path, PurePath
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Naive datetimes passed as extras serialize as ISO-8601 UTC with a trailing "Z"
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Root log level (e.g. INFO drops DEBUG records before they are built or queued)
+LOG_LEVEL = getattr(logging, os.environ.get("LOG_LEVEL", "DEBUG").upper(), logging.DEBUG)
+
+# Log file write buffer; each full buffer is one write() from the listener thread
+LOG_FILE_BUFFER_BYTES = int(os.environ.get("LOG_FILE_BUFFER_BYTES", 1024 * 1024))
+
+# Records the listener handles per wakeup before flushing stdout
+LOG_BATCH_SIZE = 256
+
+# (epoch second, "YYYY-mm-ddTHH:MM:SS") of the last formatted record
+_LAST_TS = (0, "")
+
+# Built-in LogRecord attributes; anything else on a record came from extra=
+_STD_LOGRECORD_FIELDS = frozenset({
+    "name", "msg", "args", "created", "filename", "funcName",
+    "levelname", "levelno", "lineno", "module", "msecs",
+    "message", "pathname", "process", "processName",
+    "relativeCreated", "thread", "threadName", "exc_info",
+    "exc_text", "stack_info", "taskName", "_json_cache", "_cloud_origin",
+})
+
+# Root logger setup shared by every CloudLogger in the process (see setup_logging)
+_LOGGING_STATE: Optional[Dict[str, Any]] = None
+_LOGGING_LOCK = threading.Lock()
+
+
+def _stop_listener():
+    """Stop the shared listener (flushing queued records); the next CloudLogger reconfigures."""
+    global _LOGGING_STATE
+    with _LOGGING_LOCK:
+        if _LOGGING_STATE is not None:
+            _LOGGING_STATE["listener"].stop()
+            _LOGGING_STATE = None
 
 
 class CloudLogger:
@@ -21,42 +70,91 @@ class CloudLogger:
         self.setup_logging()
     
     def setup_logging(self):
-        """Configure logging to write JSON to stdout and plain text to file."""
-        # Console handler - JSON format for cloud platforms
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(JsonFormatter(
+        """
+        Configure logging to write JSON lines to stdout and to file.
+        
+        Handlers are attached to the root logger once per process; later
+        instances reuse them and tag their records with their own
+        service/company instead of reopening files and listeners.
+        """
+        global _LOGGING_STATE
+        with _LOGGING_LOCK:
+            if _LOGGING_STATE is None:
+                _LOGGING_STATE = self._configure_root()
+        
+        origin = (self.service_name, self.company_name)
+        self._origin_extra = None if origin == _LOGGING_STATE["origin"] else {"_cloud_origin": origin}
+        
+        logger = logging.getLogger()
+        self.logger = logger
+        self.log_file = _LOGGING_STATE["log_file"]
+        
+        # Level name -> bound logger method, resolved once instead of per call
+        self._dispatch = {
+            "debug": logger.debug,
+            "info": logger.info,
+            "warning": logger.warning,
+            "error": logger.error,
+            "critical": logger.critical,
+        }
+    
+    def _configure_root(self) -> Dict[str, Any]:
+        """Attach the queue handler to the root logger and start the listener."""
+        # One formatter for both sinks: a record is serialized once, then reused
+        formatter = JsonFormatter(
             service=self.service_name,
             company=self.company_name
-        ))
+        )
+        
+        # Console handler - JSON format for cloud platforms
+        console_handler = _BatchStreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(formatter)
         
-        # File handler - traditional format for debugging
+        # File handler - same JSON lines, down to LOG_LEVEL (query with jq)
         log_dir = Path("/outputs/logs") if Path("/outputs").exists() else Path("logs")
         log_dir.mkdir(parents=True, exist_ok=True)
         
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         log_file = log_dir / f"{self.service_name}_{timestamp}.log"
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
+        file_handler.setFormatter(formatter)
+        
+        # Callers only enqueue; a listener thread does the stdout/disk writes
+        log_queue = queue.SimpleQueue()
+        listener = _BatchQueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(_stop_listener)
         
         # Configure root logger
         logger = logging.getLogger()
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(LOG_LEVEL)
         logger.handlers.clear()
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        logger.addHandler(_QueueHandler(log_queue))
         
-        self.logger = logger
-        self.log_file = log_file
+        return {
+            "listener": listener,
+            "log_file": log_file,
+            "origin": (self.service_name, self.company_name),
+        }
+    
+    def close(self):
+        """Flush queued records and stop the shared listener thread."""
+        _stop_listener()
     
     def log(self, level: str, message: str, **kwargs):
         """Log a structured message."""
-        log_func = getattr(self.logger, level.lower(), self.logger.info)
-        log_func(message, extra=kwargs)
+        log_func = self._dispatch.get(level) or self._dispatch.get(level.lower(), self.logger.info)
+        # Real logging kwargs; LogRecord refuses them as extra fields
+        exc_info = kwargs.pop("exc_info", None)
+        stack_info = kwargs.pop("stack_info", False)
+        if self._origin_extra:
+            kwargs = {**self._origin_extra, **kwargs}
+        log_func(message, exc_info=exc_info, stack_info=stack_info, extra=kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message."""
@@ -72,10 +170,14 @@ class CloudLogger:
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self.log("debug", message, **kwargs)
     
     def step(self, step_num: int, total_steps: int, message: str, **kwargs):
         """Log a pipeline step."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"[STEP {step_num}/{total_steps}] {message}",
             step=step_num,
@@ -85,10 +187,14 @@ class CloudLogger:
     
     def success(self, message: str, **kwargs):
         """Log success message."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(f"✓ {message}", status="success", **kwargs)
     
     def metric(self, name: str, value: Any, unit: str = "", **kwargs):
         """Log a metric."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.info(
             f"Metric: {name}={value}{unit}",
             metric_name=name,
@@ -105,36 +211,165 @@ class JsonFormatter(logging.Formatter):
         super().__init__()
         self.service = service
         self.company = company
+        
+        # Fields that never change are encoded once: '{"service":...,"company":...'
+        self._static_keys = frozenset({"service", "company"})
+        self._prefixes = {}
+        self._prefix = self._prefix_for(service, company)
+    
+    def _prefix_for(self, service: str, company: str):
+        """Encoded '{"service":...,"company":...,' prefix, built once per pair."""
+        prefix = self._prefixes.get((service, company))
+        if prefix is None:
+            static = {"service": service}
+            if company:
+                static["company"] = company
+            if ORJSON_AVAILABLE:
+                prefix = orjson.dumps(static)[:-1] + b","
+            else:
+                prefix = json.dumps(static)[:-1] + ", "
+            self._prefixes[(service, company)] = prefix
+        return prefix
     
     def format(self, record: logging.LogRecord) -> str:
-        """Format a log record as JSON."""
+        """Format a log record as JSON (cached on the record for other handlers)."""
+        cached = record.__dict__.get("_json_cache")
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        line = self._format(record)
+        record._json_cache = (self, line)
+        return line
+    
+    def _format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _iso_timestamp(record),
             "level": record.levelname,
-            "service": self.service,
             "message": record.getMessage(),
         }
         
-        if self.company:
-            log_data["company"] = self.company
-        
-        # Add extra fields from record
-        if hasattr(record, "__dict__"):
-            for key, value in record.__dict__.items():
-                if key not in [
-                    "name", "msg", "args", "created", "filename", "funcName",
-                    "levelname", "levelno", "lineno", "module", "msecs",
-                    "message", "pathname", "process", "processName",
-                    "relativeCreated", "thread", "threadName", "exc_info",
-                    "exc_text", "stack_info"
-                ]:
-                    log_data[key] = value
-        
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        # Add extra fields from record (frozenset lookup keeps insertion order);
+        # orjson encodes datetimes itself, the stdlib path needs them pre-converted
+        static_keys = self._static_keys
+        coerce = None if ORJSON_AVAILABLE else _coerce
+        for key, value in record.__dict__.items():
+            if key not in _STD_LOGRECORD_FIELDS and key not in static_keys:
+                log_data[key] = coerce(value) if coerce else value
         
-        return json.dumps(log_data)
+        # Add exception info if present (cached on the record like logging.Formatter)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
+        
+        # Records from other CloudLogger instances carry their own service/company
+        origin = record.__dict__.get("_cloud_origin")
+        prefix = self._prefix if origin is None else self._prefix_for(*origin)
+        
+        # Splice the per-record fields onto the prebuilt prefix (drop their leading '{')
+        if ORJSON_AVAILABLE:
+            return (prefix + orjson.dumps(log_data, default=str, option=_ORJSON_OPTS)[1:]).decode("utf-8")
+        return prefix + json.dumps(log_data, default=str)[1:]
+
+
+def _coerce(value: Any) -> Any:
+    """Convert common non-JSON extras (Path, datetime) for the stdlib encoder."""
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _iso_timestamp(record: logging.LogRecord) -> str:
+    """ISO-8601 UTC time of the record; the seconds part is formatted once per second."""
+    global _LAST_TS
+    sec = int(record.created)
+    if sec != _LAST_TS[0]:
+        _LAST_TS = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{_LAST_TS[1]}.{int(record.msecs):03d}Z"
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler with a large write buffer (LOG_FILE_BUFFER_BYTES).
+    
+    Records are flushed to disk only on WARNING and above (and on close,
+    which logging.shutdown runs at exit), instead of after every record.
+    """
+    
+    buffer_size = LOG_FILE_BUFFER_BYTES
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to _BatchQueueListener (once per batch)."""
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchQueueListener(logging.handlers.QueueListener):
+    """QueueListener that drains up to LOG_BATCH_SIZE records per wakeup."""
+    
+    def _monitor(self):
+        while True:
+            batch = [self.dequeue(True)]
+            try:
+                while len(batch) < LOG_BATCH_SIZE:
+                    batch.append(self.dequeue(False))
+            except queue.Empty:
+                pass
+            
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                    break
+                self.handle(record)
+            
+            for handler in self.handlers:
+                if isinstance(handler, _BatchStreamHandler):
+                    handler.flush()
+            if stop:
+                return
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback in exc_text instead of folding it into msg."""
+    
+    _exc_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            # Handlers format from exc_text; drop the traceback object
+            record.exc_info = None
+        return record
 
 
 def create_logger(service_name: str, company_name: str = "") -> CloudLogger:
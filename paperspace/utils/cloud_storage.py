@@ -4,17 +4,51 @@ Cloud storage utilities for Paperspace Workflows.
 Handles persistent storage in /outputs and /inputs directories.
 """
 
+import io
 import os
+import re
 import shutil
+import stat
 import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, BinaryIO
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+# (epoch second, formatted tag) of the last _now_tag() call
+_LAST_TAG = (0, "")
+
+
+def _write_json(path: Path, data: Any, indent: bool = True):
+    """Write data as JSON in a single write (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        payload = json.dumps(data, indent=2 if indent else None).encode("utf-8")
+    Path(path).write_bytes(payload)
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file (raises OSError/ValueError like json.load)."""
+    raw = Path(path).read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
 
 class CloudStorage:
     """Manage persistent storage in cloud environments."""
     
+    # Directories already created in this process (shared across instances)
+    _mkdir_cache: set = set()
+    
     def __init__(self, company_name: str):
         """
         Initialize cloud storage manager.
@@ -40,13 +74,23 @@ class CloudStorage:
             self.base_input = Path("paperspace_inputs")
             self.temp_dir = Path("temp")
         
+        # Latest Part A draft: set on save, or to the stable "latest" symlink once found
+        self._latest_part_a: Optional[Path] = None
+        
         # Create directory structure
         self.setup_directories()
     
+    def _now_tag(self) -> str:
+        """UTC timestamp for file names (YYYYmmdd_HHMMSS), formatted once per second."""
+        global _LAST_TAG
+        sec = int(time.time())
+        if sec != _LAST_TAG[0]:
+            _LAST_TAG = (sec, time.strftime("%Y%m%d_%H%M%S", time.gmtime(sec)))
+        return _LAST_TAG[1]
+    
     def _slugify(self, name: str) -> str:
         """Convert name to filesystem-safe slug."""
-        import re
-        return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_").lower()
+        return _SLUG_RE.sub("_", name).strip("_").lower()
     
     def setup_directories(self):
         """Create standard directory structure."""
@@ -61,38 +105,102 @@ class CloudStorage:
         self.part_b_dir = self.outputs_root / "part_b"
         self.final_dir = self.outputs_root / "final"
         
-        # Create all directories
-        for dir_path in [
-            self.outputs_root, self.logs_dir, self.debug_dir,
-            self.data_dir, self.reports_dir, self.vector_ids_dir,
+        # Create all directories; roots first so children need only one mkdir each
+        roots = [self.outputs_root, self.logs_dir, self.temp_dir]
+        children = [
+            self.debug_dir, self.data_dir, self.reports_dir, self.vector_ids_dir,
             self.part_a_dir, self.part_b_dir, self.final_dir,
-            self.temp_dir
-        ]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+        ]
+        created = CloudStorage._mkdir_cache
+        for dir_path in roots:
+            if dir_path in created and not dir_path.is_dir():
+                # Removed since it was cached (cleanup job/operator): re-create its subtree
+                created.difference_update([p for p in list(created) if dir_path in p.parents])
+                created.discard(dir_path)
+            if dir_path not in created:
+                dir_path.mkdir(parents=True, exist_ok=True)
+                created.add(dir_path)
+        
+        pending = [p for p in children if p not in created]
+        if self.is_cloud and len(pending) > 1:
+            # /outputs can be network-backed: overlap the per-mkdir round-trips
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                list(executor.map(lambda p: p.mkdir(exist_ok=True), pending))
+        else:
+            for dir_path in pending:
+                dir_path.mkdir(exist_ok=True)
+        created.update(pending)
     
     def save_submission(self, request_data: Dict[str, Any], 
                        confirmation_code: str) -> Path:
         """Save webhook submission data."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._now_tag()
         submission_file = self.debug_dir / f"submission_{timestamp}_{confirmation_code}.json"
         
-        with open(submission_file, 'w') as f:
-            json.dump({
-                "confirmation_code": confirmation_code,
-                "timestamp": timestamp,
-                "company_name": self.company_name,
-                "request_data": request_data,
-            }, f, indent=2)
+        _write_json(submission_file, {
+            "confirmation_code": confirmation_code,
+            "timestamp": timestamp,
+            "company_name": self.company_name,
+            "request_data": request_data,
+        })
         
         return submission_file
     
+    def reserve_path(self, filename: str) -> Path:
+        """Destination path for an uploaded file in the data directory (not opened)."""
+        return self.data_dir / filename
+    
     def save_uploaded_file(self, file_content: bytes, filename: str) -> Path:
         """Save an uploaded file."""
-        file_path = self.data_dir / filename
+        file_path = self.reserve_path(filename)
         with open(file_path, 'wb') as f:
             f.write(file_content)
         return file_path
     
+    def save_uploaded_stream(self, src: BinaryIO, filename: str,
+                             length: Optional[int] = None) -> Path:
+        """
+        Save an uploaded file from a stream without buffering it in memory.
+        
+        File-backed sources are copied in the kernel with os.sendfile; other
+        streams (e.g. BytesIO) fall back to shutil.copyfileobj in 1MB chunks.
+        length limits how many bytes are copied (default: to end of stream).
+        """
+        file_path = self.reserve_path(filename)
+        with open(file_path, 'wb') as dst:
+            # sendfile needs a regular file as its source (not a pipe/socket)
+            try:
+                src_fd = src.fileno()
+                src_stat = os.fstat(src_fd)
+                if not stat.S_ISREG(src_stat.st_mode):
+                    src_fd = None
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                src_fd = None
+            
+            if src_fd is not None:
+                offset = src.tell()
+                if length is None:
+                    length = src_stat.st_size - offset
+                remaining = length
+                while remaining > 0:
+                    sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+                src.seek(offset)
+            elif length is None:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            else:
+                remaining = length
+                while remaining > 0:
+                    chunk = src.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+        return file_path
+    
     def save_gdrive_link(self, link: str) -> Path:
         """Save Google Drive link."""
         link_file = self.data_dir / "gdrive_link.txt"
@@ -106,35 +214,52 @@ class CloudStorage:
     
     def save_vector_store_id(self, vector_store_id: str) -> Path:
         """Save vector store ID."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._now_tag()
         id_file = self.vector_ids_dir / f"vector_{timestamp}.json"
         
-        with open(id_file, 'w') as f:
-            json.dump({
-                "vector_store_id": vector_store_id,
-                "company_name": self.company_name,
-                "company_slug": self.company_slug,
-                "timestamp": timestamp,
-            }, f, indent=2)
+        data = {
+            "vector_store_id": vector_store_id,
+            "company_name": self.company_name,
+            "company_slug": self.company_slug,
+            "timestamp": timestamp,
+        }
+        _write_json(id_file, data)
         
+        self._write_pointer(self.vector_ids_dir / "vector_latest.json", data)
         return id_file
     
+    def _write_pointer(self, pointer_file: Path, data: Dict[str, Any]):
+        """Atomically replace a small "latest" JSON pointer file."""
+        tmp_file = pointer_file.with_name(pointer_file.name + ".tmp")
+        _write_json(tmp_file, data, indent=False)
+        os.replace(tmp_file, pointer_file)
+    
+    def _read_pointer(self, pointer_file: Path) -> Optional[Dict[str, Any]]:
+        """Read a pointer file written by _write_pointer (None if missing/corrupt)."""
+        try:
+            return _read_json(pointer_file)
+        except (OSError, ValueError):
+            return None
+    
     def get_latest_vector_store_id(self) -> Optional[str]:
         """Get the most recent vector store ID."""
+        latest = self._read_pointer(self.vector_ids_dir / "vector_latest.json")
+        if latest and latest.get("vector_store_id"):
+            return latest["vector_store_id"]
+        
+        # Fallback for directories written before the pointer existed
         vector_files = list(self.vector_ids_dir.glob("vector_*.json"))
         if not vector_files:
             return None
         
         vector_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
         
-        with open(vector_files[0], 'r') as f:
-            data = json.load(f)
-        
+        data = _read_json(vector_files[0])
         return data.get("vector_store_id")
     
     def save_part_a_draft(self, content: str) -> Path:
         """Save Part A draft report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._now_tag()
         draft_file = self.part_a_dir / f"report_draft_{self.company_slug}_{timestamp}.md"
         
         with open(draft_file, 'w', encoding='utf-8') as f:
@@ -151,26 +276,31 @@ class CloudStorage:
             # Fallback: just copy the file
             shutil.copy(draft_file, latest_link)
         
+        self._latest_part_a = draft_file
         return draft_file
     
     def get_latest_part_a_draft(self) -> Optional[Path]:
         """Get the latest Part A draft."""
+        if self._latest_part_a is not None:
+            return self._latest_part_a
+        
         latest_link = self.part_a_dir / f"report_draft_latest_{self.company_slug}.md"
         
         if latest_link.exists():
+            self._latest_part_a = latest_link
             return latest_link
         
-        # Fallback to most recent file
+        # Fallback to most recent file (memoized like the symlink)
         drafts = list(self.part_a_dir.glob(f"report_draft_{self.company_slug}_*.md"))
         if drafts:
-            drafts.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            return drafts[0]
+            self._latest_part_a = max(drafts, key=lambda x: x.stat().st_mtime)
+            return self._latest_part_a
         
         return None
     
     def save_part_b_report(self, content: str, report_type: str = "enhanced") -> Path:
         """Save Part B report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._now_tag()
         report_file = self.part_b_dir / f"report_{report_type}_{self.company_slug}_{timestamp}.md"
         
         with open(report_file, 'w', encoding='utf-8') as f:
@@ -180,21 +310,42 @@ class CloudStorage:
     
     def save_final_report(self, content: str) -> Path:
         """Save final consolidated report."""
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._now_tag()
         final_file = self.final_dir / f"FINAL_REPORT_{self.company_slug}_{timestamp}.md"
         
         with open(final_file, 'w', encoding='utf-8') as f:
             f.write(content)
         
-        # Create ready signal file
+        self._write_ready_signal(final_file, timestamp)
+        return final_file
+    
+    def save_final_report_path(self, src_path: Path) -> Path:
+        """Save final report by copying an existing file (no read into memory)."""
+        timestamp = self._now_tag()
+        final_file = self.final_dir / f"FINAL_REPORT_{self.company_slug}_{timestamp}.md"
+        
+        shutil.copyfile(src_path, final_file)
+        
+        self._write_ready_signal(final_file, timestamp)
+        return final_file
+    
+    def _write_ready_signal(self, final_file: Path, timestamp: str) -> Path:
+        """Create ready signal file next to a final report and update the latest pointer."""
         signal_file = self.final_dir / f"FINAL_REPORT_{self.company_slug}_{timestamp}.ready"
         with open(signal_file, 'w') as f:
             f.write(str(final_file) + "\n")
-        
-        return final_file
+        self._write_pointer(self.final_dir / "final_latest.json", {"report": final_file.name})
+        return signal_file
     
     def get_latest_final_report(self) -> Optional[Path]:
         """Get the latest final report."""
+        latest = self._read_pointer(self.final_dir / "final_latest.json")
+        if latest and latest.get("report"):
+            report = self.final_dir / latest["report"]
+            if report.exists():
+                return report
+        
+        # Fallback for directories written before the pointer existed
         reports = list(self.final_dir.glob(f"FINAL_REPORT_{self.company_slug}_*.md"))
         if reports:
             reports.sort(key=lambda x: x.stat().st_mtime, reverse=True)
@@ -219,25 +370,41 @@ class CloudStorage:
         """Get storage statistics."""
         def dir_size(path: Path) -> int:
             total = 0
-            try:
-                for item in path.rglob('*'):
-                    if item.is_file():
-                        total += item.stat().st_size
-            except Exception:
-                pass
+            pending = deque([path])
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file():
+                                total += entry.stat().st_size
+                except OSError:
+                    pass
             return total
         
+        def count(path: Path, prefix: str = "", suffix: str = "") -> int:
+            # Same matches as path.glob(f"{prefix}*{suffix}"), which skips dotfiles
+            try:
+                with os.scandir(path) as entries:
+                    return sum(
+                        1 for entry in entries
+                        if not entry.name.startswith(".")
+                        and entry.name.startswith(prefix) and entry.name.endswith(suffix)
+                    )
+            except FileNotFoundError:
+                return 0
+        
         return {
             "company": self.company_name,
             "company_slug": self.company_slug,
             "total_size_bytes": dir_size(self.outputs_root),
-            "data_files": len(list(self.data_dir.glob('*'))) if self.data_dir.exists() else 0,
-            "part_a_drafts": len(list(self.part_a_dir.glob('*.md'))) if self.part_a_dir.exists() else 0,
-            "part_b_reports": len(list(self.part_b_dir.glob('*.md'))) if self.part_b_dir.exists() else 0,
-            "final_reports": len(list(self.final_dir.glob('FINAL_*.md'))) if self.final_dir.exists() else 0,
+            "data_files": count(self.data_dir),
+            "part_a_drafts": count(self.part_a_dir, suffix=".md"),
+            "part_b_reports": count(self.part_b_dir, suffix=".md"),
+            "final_reports": count(self.final_dir, "FINAL_", ".md"),
         }
 
-
 # Example usage
 if __name__ == "__main__":
     storage = CloudStorage("Acme Corp")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+CSV to JSON conversion for company data preprocessing.
+Streams rows so memory stays flat regardless of CSV size.
+"""
+
+import csv
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Checked without importing: pyarrow is only loaded for large files
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+ENGINES = ("stdlib", "pandas")
+
+# CSVs below this size are encoded in one orjson call; larger ones stream per row
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+# CSVs at or above this size are parsed with pyarrow's multithreaded reader
+ARROW_THRESHOLD_BYTES = 100 * 1024 * 1024
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Bytes read up front to sniff the delimiter/quoting
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+
+def _sniff_dialect(fin):
+    """Sniff the dialect from the start of fin (falls back to excel)."""
+    sample = fin.read(SNIFF_SAMPLE_BYTES)
+    fin.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel
+
+
+def _dict_reader(fin) -> csv.DictReader:
+    """DictReader using the file's sniffed dialect."""
+    return csv.DictReader(fin, dialect=_sniff_dialect(fin))
+
+
+def is_converted(csv_path: Path, json_path: Path) -> bool:
+    """True if json_path exists and is at least as new as csv_path."""
+    try:
+        return Path(json_path).stat().st_mtime >= Path(csv_path).stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def convert_csv_to_json(csv_path: Path, json_path: Path, engine: str = "stdlib") -> int:
+    """
+    Convert a CSV file to a JSON array of row objects.
+
+    The default engine streams one row at a time with csv.DictReader and
+    writes records incrementally; files over ARROW_THRESHOLD_BYTES are
+    parsed with pyarrow when it is installed. The "pandas" engine is kept
+    as a fallback for type-inferred output (numbers stay numbers).
+
+    Output goes to a temporary file that is renamed into place, so a
+    crashed run never leaves a partial JSON that is_converted() would accept.
+
+    Returns:
+        Number of records written
+    """
+    json_path = Path(json_path)
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    try:
+        count = _convert(csv_path, tmp_path, engine)
+        os.replace(tmp_path, json_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
+
+
+def _convert(csv_path: Path, json_path: Path, engine: str) -> int:
+    """Write the converted records to json_path with the chosen engine."""
+    if engine == "pandas":
+        import pandas as pd
+        df = pd.read_csv(csv_path)
+        df.to_json(json_path, orient="records", indent=2)
+        return len(df)
+
+    if PYARROW_AVAILABLE and Path(csv_path).stat().st_size >= ARROW_THRESHOLD_BYTES:
+        return _convert_arrow(csv_path, json_path)
+
+    if ORJSON_AVAILABLE:
+        return _convert_orjson(csv_path, json_path)
+
+    count = 0
+    with open(csv_path, newline="", encoding="utf-8-sig") as fin, \
+            open(json_path, "w", encoding="utf-8") as fout:
+        fout.write("[\n")
+        for row in _dict_reader(fin):
+            if count:
+                fout.write(",\n")
+            json.dump(row, fout, ensure_ascii=False)
+            count += 1
+        fout.write("\n]\n")
+    return count
+
+
+def _convert_orjson(csv_path: Path, json_path: Path) -> int:
+    """orjson variant: one encode for small files, per-row encode for large ones."""
+    with open(csv_path, newline="", encoding="utf-8-sig") as fin, \
+            open(json_path, "wb") as fout:
+        reader = _dict_reader(fin)
+
+        if Path(csv_path).stat().st_size < STREAM_THRESHOLD_BYTES:
+            records = list(reader)
+            fout.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+            return len(records)
+
+        count = 0
+        fout.write(b"[\n")
+        for row in reader:
+            if count:
+                fout.write(b",\n")
+            fout.write(orjson.dumps(row))
+            count += 1
+        fout.write(b"\n]\n")
+        return count
+
+
+def _convert_arrow(csv_path: Path, json_path: Path) -> int:
+    """pyarrow variant: multithreaded parse in 16MB blocks, written per record batch."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    with open(csv_path, newline="", encoding="utf-8-sig") as fin:
+        dialect = _sniff_dialect(fin)
+        header = next(csv.reader(fin, dialect), [])
+
+    # Every column as string so output matches the stdlib engine
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(
+            block_size=ARROW_BLOCK_SIZE,
+            use_threads=True,
+            column_names=header,
+            skip_rows=1,
+        ),
+        parse_options=pacsv.ParseOptions(
+            delimiter=dialect.delimiter,
+            quote_char=dialect.quotechar or False,
+            double_quote=dialect.doublequote,
+            newlines_in_values=True,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+        ),
+    )
+
+    if ORJSON_AVAILABLE:
+        dumps = orjson.dumps
+    else:
+        def dumps(row):
+            return json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+    count = 0
+    with open(json_path, "wb") as fout:
+        fout.write(b"[\n")
+        for batch in table.to_batches():
+            for row in batch.to_pylist():
+                if count:
+                    fout.write(b",\n")
+                fout.write(dumps(row))
+                count += 1
+        fout.write(b"\n]\n")
+    return count
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared Google Drive helpers: URL parsing and client construction.
+Credentials and the built service are memoized per (credentials file, scopes)
+so repeated uploads/downloads skip key parsing and discovery.
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+DRIVE_SCOPE = "https://www.googleapis.com/auth/drive"
+DRIVE_READONLY_SCOPE = "https://www.googleapis.com/auth/drive.readonly"
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+
+# Built services/sessions per (credentials file, scopes); guarded so
+# concurrent first calls build only once
+_SERVICES: dict = {}
+_SERVICES_LOCK = threading.Lock()
+
+# All URL shapes in one pass: .../folders/<id>, .../file/d/<id> or ...?id=<id>
+_GID_RE = re.compile(r"/(?:folders|file/d)/([a-zA-Z0-9_-]+)|[?&]id=([a-zA-Z0-9_-]+)")
+
+
+@lru_cache(maxsize=1024)
+def extract_google_id(url: str) -> str:
+    """Extract Google Drive file/folder ID from common URL patterns."""
+    if not url:
+        return ""
+    m = _GID_RE.search(url)
+    return (m.group(1) or m.group(2)) if m else ""
+
+
+@lru_cache(maxsize=4)
+def get_drive_credentials(creds_path: str, scopes: tuple = (DRIVE_SCOPE,)):
+    """Load service account credentials for the given scopes."""
+    from google.oauth2.service_account import Credentials
+    return Credentials.from_service_account_file(creds_path, scopes=list(scopes))
+
+
+def get_drive_service(creds_path: str, scopes: tuple = (DRIVE_SCOPE,)):
+    """
+    Build (once per process) a Drive v3 service.
+
+    Uses the discovery document bundled with google-api-python-client
+    (static_discovery) so no discovery request is made. The service's own
+    httplib2 connection is not thread-safe: threaded callers should pass
+    their own http= to execute().
+    """
+    key = (creds_path, scopes)
+    service = _SERVICES.get(key)
+    if service is None:
+        with _SERVICES_LOCK:
+            service = _SERVICES.get(key)
+            if service is None:
+                from googleapiclient.discovery import build
+                service = _SERVICES[key] = build(
+                    "drive",
+                    "v3",
+                    credentials=get_drive_credentials(creds_path, scopes),
+                    cache_discovery=False,
+                    static_discovery=True,
+                )
+    return service
+
+
+def get_drive_session(creds_path: str, scopes: tuple = (DRIVE_SCOPE,),
+                      pool_connections: int = 16, pool_maxsize: int = 32):
+    """
+    AuthorizedSession (requests/urllib3) for raw Drive HTTP calls such as
+    alt=media downloads. One per process: its connection pool is shared
+    by all threads, so parallel downloads reuse keepalive TLS connections.
+    """
+    key = ("session", creds_path, scopes)
+    session = _SERVICES.get(key)
+    if session is None:
+        with _SERVICES_LOCK:
+            session = _SERVICES.get(key)
+            if session is None:
+                from google.auth.transport.requests import AuthorizedSession
+                from requests.adapters import HTTPAdapter
+                session = AuthorizedSession(get_drive_credentials(creds_path, scopes))
+                session.mount("https://", HTTPAdapter(
+                    pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                ))
+                _SERVICES[key] = session
+    return session
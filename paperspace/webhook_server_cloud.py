@@ -9,12 +9,21 @@ Cloud-compatible Flask webhook server for Paperspace Workflows.
 
 import os
 import json
+import logging
 import time
 import uuid
-import re
 import sys
+import shutil
+import importlib.util
+import queue
+import random
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
@@ -26,19 +35,33 @@ if ROOT_DIR not in sys.path:
 # Import cloud utilities
 from paperspace.utils.cloud_logging import create_logger
 from paperspace.utils.cloud_storage import CloudStorage
+from paperspace.utils.gdrive import (
+    DRIVE_FILES_URL,
+    DRIVE_READONLY_SCOPE,
+    extract_google_id,
+    get_drive_credentials,
+    get_drive_service,
+    get_drive_session,
+)
 
 # Optional Google Drive API imports
 try:
-    from google.oauth2.service_account import Credentials as GCredentials
-    from googleapiclient.discovery import build as gbuild
-    from googleapiclient.http import MediaIoBaseDownload
-    import io
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
+    import requests
     GOOGLE_API_AVAILABLE = True
     GOOGLE_API_IMPORT_ERROR = None
 except Exception as _ga_err:
     GOOGLE_API_AVAILABLE = False
     GOOGLE_API_IMPORT_ERROR = str(_ga_err)
 
+# Optional orjson for request parsing and JSON responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Optional Paperspace SDK for triggering workflows
 try:
     import gradient
@@ -50,7 +73,18 @@ except Exception:
 # -----------------------------------------------------------------------------
 # App & CORS
 # -----------------------------------------------------------------------------
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (jsonify, request.get_json)."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # Global logger (will be created per-request with company context)
@@ -74,6 +108,34 @@ GDRIVE_FINAL_REPORT_FOLDER = os.environ.get(
     "https://drive.google.com/drive/folders/17mklV-Pz7Jqv1ZQiDNvYOvNA6qXzROXF",
 )
 
+# Google Drive downloads: parallel files, large media chunks, retry on 429/5xx
+GDRIVE_DOWNLOAD_WORKERS = 8
+GDRIVE_CHUNK_SIZE = 16 * 1024 * 1024
+GDRIVE_MAX_RETRIES = 10
+GDRIVE_RETRY_STATUSES = {429, 500, 502, 503, 504}
+GDRIVE_BATCH_SIZE = 100  # Drive's limit on sub-requests per batch
+GDRIVE_PROGRESS_EVERY = 50  # Files between INFO progress lines (per-file at DEBUG)
+
+# Background processing of submissions (Drive download + workflow trigger)
+SUBMISSION_WORKERS = 8
+JOB_HISTORY_LIMIT = 1000  # Most recent job statuses kept for /status
+
+# Workflow triggers: retried in the background, pending ones persisted across restarts
+WORKFLOW_MAX_ATTEMPTS = 10
+WORKFLOW_BACKOFF_BASE = 1.0
+WORKFLOW_BACKOFF_CAP = 60.0
+# Each process persists to pending_workflows-<pid>.jsonl; files of dead
+# processes are adopted by whichever process holds the lock file
+WORKFLOW_QUEUE_DIR = Path("/outputs") if Path("/outputs").exists() else Path("paperspace_outputs")
+WORKFLOW_QUEUE_LOCK = WORKFLOW_QUEUE_DIR / "pending_workflows.lock"
+WORKFLOW_ADOPT_INTERVAL = 60.0  # Idle dispatcher re-checks for orphaned queue files
+
+# Gunicorn serving in the cloud. One worker by default: the /status job table
+# is in-process, so extra workers need sticky routing by confirmation code.
+WEBHOOK_WORKERS = int(os.environ.get("WEBHOOK_WORKERS", "1"))
+WEBHOOK_WORKER_CONNECTIONS = int(os.environ.get("WEBHOOK_WORKER_CONNECTIONS", "1000"))  # gevent
+WEBHOOK_THREADS = int(os.environ.get("WEBHOOK_THREADS", "16"))  # gthread fallback
+
 # Paperspace configuration
 PAPERSPACE_API_KEY = os.environ.get("PAPERSPACE_API_KEY", "").strip()
 PAPERSPACE_PROJECT_ID = os.environ.get("PAPERSPACE_PROJECT_ID", "").strip()
@@ -84,78 +146,127 @@ PAPERSPACE_WORKFLOW_ID = os.environ.get("PAPERSPACE_WORKFLOW_ID", "").strip()
 # -----------------------------------------------------------------------------
 SUPPORTED_EXTENSIONS = {'.txt', '.pdf', '.docx', '.md', '.json', '.csv'}
 
-def slugify(name: str) -> str:
-    """Simple filesystem-safe slug."""
-    name = (name or "").strip()
-    if not name:
-        return "unknown_company"
-    
-    safe = []
-    for ch in name:
-        if ch.isalnum() or ch in ("-", "_"):
-            safe.append(ch)
-        elif ch.isspace():
-            safe.append("_")
-        else:
-            safe.append("_")
+# Company name keys/casings, in priority order
+_NAME_KEYS = (
+    "company_name",
+    "name",
+    "company",
+    "companyName",
+    "Company Name",
+    "Json Data Company Name",
+)
+
+def extract_company_name(request_data: dict, form_data: Mapping) -> str:
+    """
+    Extract company name from multiple possible keys/casings.
     
-    slug = "".join(safe).strip("_")
-    return slug or "unknown_company"
-
-def extract_company_name(request_data: dict, form_data: dict) -> str:
-    """Extract company name from multiple possible keys/casings."""
-    candidates = [
-        "company_name",
-        "name",
-        "company",
-        "companyName",
-        "Company Name",
-        "Json Data Company Name",
-    ]
-    for key in candidates:
-        if isinstance(request_data, dict) and key in request_data and request_data.get(key):
-            return str(request_data.get(key)).strip()
-    for key in candidates:
-        if key in form_data and form_data.get(key):
-            val = form_data.get(key)
-            if isinstance(val, list):
-                val = val[0]
-            return str(val).strip()
+    form_data may be request.form itself: MultiDict.get returns the first value.
+    """
+    for source in (request_data, form_data):
+        if not isinstance(source, Mapping):
+            continue
+        for key in _NAME_KEYS:
+            val = source.get(key)
+            if val:
+                return str(val).strip()
     return "unknown_company"
 
+def _get_storage(company_name: str) -> CloudStorage:
+    """Fresh CloudStorage per request (mkdirs are skipped via CloudStorage._mkdir_cache)."""
+    return CloudStorage(company_name)
+
+# Use-case count fields, in priority order
+_USE_CASE_KEYS = (
+    "use_cases",
+    "use_cases_count",
+    "readiness_score",
+    "Number of use cases to generate",
+)
+
 def parse_use_cases_count(request_data: dict) -> int:
     """Resolve number of use cases from several possible fields."""
-    candidates = [
-        "use_cases",
-        "use_cases_count",
-        "readiness_score",
-        "Number of use cases to generate",
-    ]
-    for key in candidates:
-        if key in request_data and request_data.get(key) not in (None, ""):
-            try:
-                return int(str(request_data.get(key)).strip())
-            except Exception:
-                continue
+    for key in _USE_CASE_KEYS:
+        val = request_data.get(key)
+        if val is None or val == "":
+            continue
+        # JSON payloads usually carry the count as a number already
+        if isinstance(val, int) and not isinstance(val, bool):
+            return val
+        try:
+            return int(str(val).strip())
+        except (TypeError, ValueError):
+            continue
     return 7
 
-def extract_google_id(url: str) -> str:
-    """Extract Google Drive file/folder ID from common URL patterns."""
-    if not url:
-        return ""
-    m = re.search(r"/folders/([a-zA-Z0-9_-]+)", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"/file/d/([a-zA-Z0-9_-]+)", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"[?&]id=([a-zA-Z0-9_-]+)", url)
-    if m:
-        return m.group(1)
-    return ""
+FILE_MOVE_WORKERS = 4
+
+@lru_cache(maxsize=1024)
+def _safe_filename(filename: str) -> str:
+    """secure_filename, memoized: upload names repeat across submissions."""
+    return secure_filename(filename)
+
+def _unique_name(name: str, seen: set) -> str:
+    """name, or name_<n> before the extension if already in seen; records the result."""
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while name in seen:
+        name = f"{stem}_{n}{ext}"
+        n += 1
+    seen.add(name)
+    return name
+
+def _move_file(src: str, dest: str):
+    try:
+        os.rename(src, dest)
+    except OSError:
+        # e.g. /tmp and /outputs on different filesystems
+        shutil.move(src, dest)
+
+def move_downloaded_files(src_dir: Path, dest_dir: Path, logger) -> int:
+    """Flatten every file under src_dir into dest_dir; returns the number moved."""
+    # Collect (src, dest) pairs in one scandir walk; same-named files from
+    # different subfolders get a numeric suffix instead of overwriting each other
+    pairs = []
+    seen = set()
+    stack = [str(src_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = _unique_name(entry.name, seen)
+                    pairs.append((entry.path, os.path.join(dest_dir, name)))
+    
+    if len(pairs) > 1:
+        with ThreadPoolExecutor(max_workers=FILE_MOVE_WORKERS) as executor:
+            list(executor.map(lambda p: _move_file(*p), pairs))
+    elif pairs:
+        _move_file(*pairs[0])
+    
+    if logger.logger.isEnabledFor(logging.DEBUG):
+        for _, dest in pairs:
+            logger.debug(f"Moved downloaded file: {os.path.basename(dest)}")
+    logger.info(f"Moved {len(pairs)} downloaded file(s) to {dest_dir}")
+    return len(pairs)
+
+def _gdrive_retry_delay(retry_after, attempt: int) -> float:
+    """Seconds to wait before retrying a Drive request: Retry-After, else jittered backoff."""
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, 64) + random.random()
+
+class GDriveListingError(Exception):
+    """A Drive folder could not be listed after retries, so the download would be incomplete."""
 
 def try_download_gdrive_service_account(url: str, dest_dir: Path, logger) -> bool:
-    """Download Google Drive folder/file using service account."""
+    """
+    Download Google Drive folder/file using service account.
+    
+    Raises GDriveListingError if part of the folder tree cannot be listed;
+    other failures are logged and reported as False.
+    """
     logger.info(f"Starting service-account Google Drive download: {url}")
     
     try:
@@ -168,8 +279,9 @@ def try_download_gdrive_service_account(url: str, dest_dir: Path, logger) -> boo
             logger.warning(f"Service account credentials not found at {creds_path}")
             return False
 
-        scopes = ["https://www.googleapis.com/auth/drive.readonly"]
-        creds = GCredentials.from_service_account_file(str(creds_path), scopes=scopes)
+        # Credentials and service are built once per process and shared across requests
+        scopes = (DRIVE_READONLY_SCOPE,)
+        creds = get_drive_credentials(str(creds_path), scopes)
         
         try:
             sa_email = getattr(creds, "service_account_email", None)
@@ -178,7 +290,8 @@ def try_download_gdrive_service_account(url: str, dest_dir: Path, logger) -> boo
         except Exception:
             pass
 
-        service = gbuild("drive", "v3", credentials=creds)
+        service = get_drive_service(str(creds_path), scopes)
+        session = get_drive_session(str(creds_path), scopes)
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         drive_id = extract_google_id(url)
@@ -186,82 +299,472 @@ def try_download_gdrive_service_account(url: str, dest_dir: Path, logger) -> boo
             logger.warning("Could not parse Drive ID from URL")
             return False
 
-        downloaded_count = 0
+        # Per-file lines are DEBUG; check once so the f-strings are skipped when it is off
+        log_each_file = logger.logger.isEnabledFor(logging.DEBUG)
+
+        # Metadata calls go through httplib2, which is not thread-safe: one Http per thread
+        thread_local = threading.local()
+
+        def thread_http():
+            if not hasattr(thread_local, "http"):
+                thread_local.http = AuthorizedHttp(creds, http=httplib2.Http())
+            return thread_local.http
 
         def download_file(file_id: str, file_name: str, out_dir: Path) -> bool:
-            nonlocal downloaded_count
+            """Stream alt=media to disk over the shared session, resuming with Range on retry."""
+            out_path = out_dir / file_name
+            url = f"{DRIVE_FILES_URL}/{file_id}"
             try:
-                request_media = service.files().get_media(fileId=file_id)
-                out_path = out_dir / file_name
-                fh = io.FileIO(str(out_path), mode="wb")
-                downloader = MediaIoBaseDownload(fh, request_media, chunksize=1024 * 1024)
-                done = False
-                while not done:
-                    status, done = downloader.next_chunk()
-                logger.info(f"Downloaded file: {out_path}")
-                downloaded_count += 1
+                with open(out_path, "wb") as fh:
+                    attempt = 0
+                    while True:
+                        headers = {"Range": f"bytes={fh.tell()}-"} if fh.tell() else None
+                        try:
+                            with session.get(url, params={"alt": "media"}, headers=headers,
+                                             stream=True, timeout=(10, 300)) as resp:
+                                resp.raise_for_status()
+                                if headers and resp.status_code != 206:
+                                    fh.seek(0)
+                                    fh.truncate()
+                                for chunk in resp.iter_content(chunk_size=GDRIVE_CHUNK_SIZE):
+                                    fh.write(chunk)
+                            break
+                        except (requests.ConnectionError, requests.Timeout, requests.HTTPError,
+                                requests.exceptions.ChunkedEncodingError) as e:
+                            status = getattr(e.response, "status_code", None)
+                            if status is not None and status not in GDRIVE_RETRY_STATUSES:
+                                raise
+                            if attempt >= GDRIVE_MAX_RETRIES:
+                                raise
+                            delay = _gdrive_retry_delay(
+                                e.response.headers.get("Retry-After") if e.response is not None else None,
+                                attempt,
+                            )
+                            attempt += 1
+                            logger.warning(f"Drive download of {file_name} failed ({e}); retry {attempt} in {delay:.1f}s")
+                            time.sleep(delay)
+                if log_each_file:
+                    logger.debug(f"Downloaded file: {out_path}")
                 return True
             except Exception as e:
                 logger.error(f"Failed downloading {file_name}: {e}")
                 return False
 
-        def download_folder(folder_id: str, out_dir: Path) -> int:
-            nonlocal downloaded_count
-            out_dir.mkdir(parents=True, exist_ok=True)
-            page_token = None
-            while True:
-                try:
-                    resp = service.files().list(
-                        q=f"'{folder_id}' in parents and trashed=false",
-                        fields="nextPageToken, files(id, name, mimeType)",
-                        pageToken=page_token,
-                    ).execute()
-                except Exception as e:
-                    logger.error(f"List files failed for folder {folder_id}: {e}")
-                    break
-
-                for item in resp.get("files", []):
-                    item_id = item.get("id")
-                    name = item.get("name") or item_id
-                    mime = item.get("mimeType") or ""
-                    if mime == "application/vnd.google-apps.folder":
-                        download_folder(item_id, out_dir / name)
-                    elif mime.startswith("application/vnd.google-apps"):
-                        logger.info(f"Skip Google Docs type: {name}")
-                    else:
-                        download_file(item_id, name, out_dir)
-
-                page_token = resp.get("nextPageToken")
-                if not page_token:
-                    break
-            return downloaded_count
+        def collect_tree(root_id: str, root_dir: Path) -> list:
+            """
+            Phase 1: BFS over the folder tree, returning (file_id, name, out_dir) work items.
+            
+            Each level's files().list calls (one per folder/page) go out as
+            HTTP batch requests of up to GDRIVE_BATCH_SIZE sub-requests.
+            """
+            work = []
+            # Names taken per local directory: Drive allows duplicate names in one
+            # folder, and parallel writers must never share a path
+            taken = {}
+            pending = [(root_id, root_dir, None, 0)]  # (folder_id, out_dir, page_token, attempts)
+            while pending:
+                next_round = []
+                retry_delay = [0.0]
+
+                def requeue(item, retry_after, error):
+                    """Retry a listing next round, or give up on the whole download."""
+                    folder_id, out_dir, page_token, attempts = item
+                    if attempts >= GDRIVE_MAX_RETRIES:
+                        raise GDriveListingError(
+                            f"Listing folder {folder_id} failed after {GDRIVE_MAX_RETRIES} retries: {error}"
+                        )
+                    next_round.append((folder_id, out_dir, page_token, attempts + 1))
+                    retry_delay[0] = max(retry_delay[0], _gdrive_retry_delay(retry_after, attempts))
+
+                def on_list(folder_id, out_dir, page_token, attempts):
+                    def callback(request_id, resp, exception):
+                        if exception is not None:
+                            status = getattr(getattr(exception, "resp", None), "status", None)
+                            if status in GDRIVE_RETRY_STATUSES:
+                                retry_after = exception.resp.get("retry-after")
+                                requeue((folder_id, out_dir, page_token, attempts), retry_after, exception)
+                            else:
+                                logger.error(f"List files failed for folder {folder_id}: {exception}")
+                            return
+
+                        seen = taken.setdefault(out_dir, set())
+                        for item in resp.get("files", []):
+                            item_id = item.get("id")
+                            name = item.get("name") or item_id
+                            mime = item.get("mimeType") or ""
+                            if mime == "application/vnd.google-apps.folder":
+                                next_round.append((item_id, out_dir / _unique_name(name, seen), None, 0))
+                            elif mime.startswith("application/vnd.google-apps"):
+                                logger.info(f"Skip Google Docs type: {name}")
+                            else:
+                                work.append((item_id, _unique_name(name, seen), out_dir))
+
+                        if resp.get("nextPageToken"):
+                            next_round.append((folder_id, out_dir, resp["nextPageToken"], 0))
+                    return callback
+
+                for i in range(0, len(pending), GDRIVE_BATCH_SIZE):
+                    batch = service.new_batch_http_request()
+                    chunk = pending[i:i + GDRIVE_BATCH_SIZE]
+                    for folder_id, out_dir, page_token, attempts in chunk:
+                        out_dir.mkdir(parents=True, exist_ok=True)
+                        batch.add(
+                            service.files().list(
+                                q=f"'{folder_id}' in parents and trashed=false",
+                                fields="nextPageToken, files(id, name, mimeType)",
+                                pageToken=page_token,
+                            ),
+                            callback=on_list(folder_id, out_dir, page_token, attempts),
+                        )
+                    try:
+                        batch.execute(http=thread_http())
+                    except GDriveListingError:
+                        raise
+                    except Exception as e:
+                        # The whole batch failed: every folder in it goes back on the queue
+                        logger.warning(f"Batch folder listing failed ({e}); requeueing {len(chunk)} folder(s)")
+                        headers = getattr(e, "resp", None)
+                        retry_after = headers.get("retry-after") if headers is not None else None
+                        for item in chunk:
+                            requeue(item, retry_after, e)
+
+                if retry_delay[0]:
+                    logger.warning(f"Drive rate-limited folder listing; retrying in {retry_delay[0]:.1f}s")
+                    time.sleep(retry_delay[0])
+                pending = next_round
+            return work
 
         # Fetch metadata
         try:
-            meta = service.files().get(fileId=drive_id, fields="id, name, mimeType").execute()
+            meta = service.files().get(fileId=drive_id, fields="id, name, mimeType").execute(http=thread_http())
         except Exception as e:
             logger.error(f"Failed to fetch metadata for {drive_id}: {e}")
             return False
 
+        downloaded_count = 0
         mime_top = meta.get("mimeType", "")
         if mime_top == "application/vnd.google-apps.folder":
             logger.info(f"Identified folder: {meta.get('name')}")
-            download_folder(drive_id, dest_dir)
+            work = collect_tree(drive_id, dest_dir)
+            # Phase 2: download every file in parallel
+            if work:
+                with ThreadPoolExecutor(max_workers=min(GDRIVE_DOWNLOAD_WORKERS, len(work))) as executor:
+                    futures = [executor.submit(download_file, *item) for item in work]
+                    for done, future in enumerate(as_completed(futures), 1):
+                        downloaded_count += future.result()
+                        if done % GDRIVE_PROGRESS_EVERY == 0:
+                            logger.info(f"Downloaded {downloaded_count}/{len(work)} files ({done} processed)")
         elif mime_top.startswith("application/vnd.google-apps"):
             logger.info(f"Top-level item is Google Doc type; export not implemented")
         else:
             fname = meta.get("name") or f"download_{drive_id}"
-            download_file(drive_id, fname, dest_dir)
+            if download_file(drive_id, fname, dest_dir):
+                downloaded_count = 1
 
         logger.success(f"Service-account download finished with {downloaded_count} file(s)")
         return downloaded_count > 0
         
+    except GDriveListingError:
+        raise
     except Exception as e:
         logger.error(f"Service-account download crashed: {e}")
         return False
 
-def trigger_paperspace_workflow(company_name: str, request_data: dict, storage: CloudStorage, logger):
-    """Trigger a Paperspace Workflow to run the pipeline."""
+# -----------------------------------------------------------------------------
+# Background submission jobs
+# -----------------------------------------------------------------------------
+_submission_executor = ThreadPoolExecutor(
+    max_workers=SUBMISSION_WORKERS, thread_name_prefix="submission"
+)
+_jobs = {}  # confirmation_code -> status dict
+_jobs_lock = threading.Lock()
+
+def _set_job(confirmation_code: str, **fields):
+    """Create or update a job's status entry, evicting the oldest beyond JOB_HISTORY_LIMIT."""
+    with _jobs_lock:
+        job = _jobs.setdefault(confirmation_code, {"confirmation_code": confirmation_code})
+        job.update(fields, updated_at=time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()))
+        while len(_jobs) > JOB_HISTORY_LIMIT:
+            del _jobs[next(iter(_jobs))]
+
+def _process_submission(company_name: str, request_data: dict, confirmation_code: str):
+    """Worker: Google Drive download, storage stats and workflow trigger for one submission."""
+    logger = create_logger("webhook_handler", company_name)
+    storage = _get_storage(company_name)
+    _set_job(confirmation_code, status="processing")
+    
+    try:
+        # Save Google Drive link if provided
+        gdrive_link = (
+            request_data.get("google_drive_link")
+            or request_data.get("Google Drive Link")
+            or request_data.get("googleDriveLink")
+        )
+        if gdrive_link:
+            storage.save_gdrive_link(gdrive_link)
+            logger.info(f"Saved Google Drive link")
+            
+            # Attempt to download files from Google Drive; temp_dir is shared by all
+            # companies, so each job downloads into its own directory
+            gdrive_dir = storage.temp_dir / f"drive_download_{confirmation_code}"
+            try:
+                if try_download_gdrive_service_account(str(gdrive_link), gdrive_dir, logger):
+                    # Move downloaded files to data directory
+                    move_downloaded_files(gdrive_dir, storage.data_dir, logger)
+            except GDriveListingError:
+                # Missing subtrees: fail the job rather than run on partial data
+                raise
+            except Exception as e:
+                logger.error(f"Google Drive download failed: {e}")
+            finally:
+                shutil.rmtree(gdrive_dir, ignore_errors=True)
+        
+        # Log storage stats
+        stats = storage.get_storage_stats()
+        logger.metric("data_files", stats["data_files"])
+        logger.metric("total_size_bytes", stats["total_size_bytes"])
+        
+        # Trigger Paperspace Workflow (instead of local pipeline)
+        workflow_triggered = trigger_paperspace_workflow(
+            company_name, request_data, storage, logger, confirmation_code
+        )
+        
+        _set_job(
+            confirmation_code,
+            status="completed",
+            data_files=stats["data_files"],
+            workflow_triggered=workflow_triggered,
+        )
+        logger.success(f"Webhook processing complete. Confirmation: {confirmation_code}")
+    except Exception as e:
+        _set_job(confirmation_code, status="failed", error=str(e))
+        logger.error(f"Background processing failed for {confirmation_code}: {e}", exc_info=True)
+
+# -----------------------------------------------------------------------------
+# Workflow trigger queue
+# -----------------------------------------------------------------------------
+_workflow_queue = queue.Queue()
+_pending_workflows = {}  # confirmation_code -> entry; mirrored to _queue_file()
+_workflow_lock = threading.Lock()
+_workflow_thread = None
+_adopt_lock_fd = None  # held for the process lifetime once acquired
+
+def _queue_file() -> Path:
+    """This process's pending-trigger file (pid read at call time: gunicorn forks)."""
+    return WORKFLOW_QUEUE_DIR / f"pending_workflows-{os.getpid()}.jsonl"
+
+def _save_pending_workflows():
+    """Rewrite this process's queue file from _pending_workflows (caller holds _workflow_lock)."""
+    queue_file = _queue_file()
+    queue_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = queue_file.with_name(queue_file.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in _pending_workflows.values():
+            f.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, queue_file)
+
+def _load_pending_workflows(path: Path) -> list:
+    """Entries persisted in a queue file."""
+    entries = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _orphaned_queue_files() -> list:
+    """Queue files whose owning process is gone (plus the legacy single file)."""
+    orphans = []
+    for path in WORKFLOW_QUEUE_DIR.glob("pending_workflows*.jsonl"):
+        pid = path.stem.rpartition("-")[2]
+        if pid.isdigit() and (int(pid) == os.getpid() or _pid_alive(int(pid))):
+            continue
+        orphans.append(path)
+    return orphans
+
+def _acquire_adopt_lock() -> bool:
+    """Take the adoption lock (non-blocking) so exactly one live process resumes orphans."""
+    global _adopt_lock_fd
+    if _adopt_lock_fd is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (non-POSIX host): skip adoption; this process's own triggers are unaffected
+        return False
+    try:
+        WORKFLOW_QUEUE_DIR.mkdir(parents=True, exist_ok=True)
+        fd = os.open(WORKFLOW_QUEUE_LOCK, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _adopt_lock_fd = fd
+    return True
+
+def _adopt_orphaned_workflows():
+    """Move triggers left by dead processes into this process's queue (caller holds _workflow_lock)."""
+    if not _acquire_adopt_lock():
+        return
+    orphans = _orphaned_queue_files()
+    adopted = []
+    for path in orphans:
+        for entry in _load_pending_workflows(path):
+            if entry.get("confirmation_code") not in _pending_workflows:
+                _pending_workflows[entry["confirmation_code"]] = entry
+                adopted.append(entry)
+    if not orphans:
+        return
+    # Persist under our pid before deleting the old files so nothing is lost on a crash
+    _save_pending_workflows()
+    for path in orphans:
+        path.unlink(missing_ok=True)
+    for entry in adopted:
+        _workflow_queue.put(entry)
+
+# Transport errors worth retrying a workflow trigger on (gradient talks HTTP via requests)
+try:
+    import requests as _requests
+    _TRANSIENT_ERRORS = (ConnectionError, TimeoutError,
+                         _requests.ConnectionError, _requests.Timeout)
+except ImportError:
+    _TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+def _workflow_error_retryable(error) -> bool:
+    """True for 429/5xx responses and connection errors; auth, other 4xx and config errors fail fast."""
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return True
+    response = getattr(error, "response", None)
+    status = (
+        getattr(error, "status_code", None)
+        or getattr(error, "status", None)
+        or getattr(response, "status_code", None)
+    )
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False
+    return status == 429 or 500 <= status < 600
+
+def _workflow_retry_delay(error, attempt: int) -> float:
+    """Retry-After from the API response if present, else capped jittered backoff."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return min(WORKFLOW_BACKOFF_BASE * 2 ** attempt, WORKFLOW_BACKOFF_CAP) + random.random()
+
+def _dispatch_workflows():
+    """Dispatcher thread: run queued workflow triggers one at a time, with retries."""
+    client = None
+    while True:
+        try:
+            entry = _workflow_queue.get(timeout=WORKFLOW_ADOPT_INTERVAL)
+        except queue.Empty:
+            # Pick up triggers from workers that died since boot
+            with _workflow_lock:
+                _adopt_orphaned_workflows()
+            continue
+        code = entry["confirmation_code"]
+        logger = create_logger("workflow_dispatcher", entry["company_name"])
+        run_id = None
+        last_error = None
+        for attempt in range(WORKFLOW_MAX_ATTEMPTS):
+            try:
+                if client is None:
+                    client = WorkflowsClient(api_key=PAPERSPACE_API_KEY)
+                run = client.run_workflow(workflow_id=entry["workflow_id"], inputs=entry["params"])
+                run_id = run.id
+                break
+            except Exception as e:
+                last_error = e
+                if not _workflow_error_retryable(e):
+                    logger.error(f"Failed to trigger Paperspace Workflow (not retryable): {e}")
+                    break
+                if attempt + 1 >= WORKFLOW_MAX_ATTEMPTS:
+                    logger.error(f"Failed to trigger Paperspace Workflow after {WORKFLOW_MAX_ATTEMPTS} attempts: {e}")
+                    break
+                delay = _workflow_retry_delay(e, attempt)
+                logger.warning(f"Workflow trigger failed ({e}); retry {attempt + 1} in {delay:.1f}s")
+                time.sleep(delay)
+        
+        if run_id is not None:
+            logger.success(f"Workflow triggered successfully. Run ID: {run_id}")
+            _set_job(code, workflow_status="triggered", workflow_run_id=str(run_id))
+        else:
+            _set_job(code, workflow_status="failed", workflow_error=str(last_error))
+        with _workflow_lock:
+            _pending_workflows.pop(code, None)
+            try:
+                _save_pending_workflows()
+            except OSError as e:
+                logger.error(f"Could not update {_queue_file()}: {e}")
+
+def _start_workflow_dispatcher():
+    """Start the dispatcher once per process, adopting triggers left by dead processes."""
+    global _workflow_thread
+    with _workflow_lock:
+        if _workflow_thread is not None:
+            return
+        _adopt_orphaned_workflows()
+        _workflow_thread = threading.Thread(
+            target=_dispatch_workflows, name="workflow-dispatcher", daemon=True
+        )
+        _workflow_thread.start()
+
+def _enqueue_workflow(confirmation_code: str, company_name: str, params: dict):
+    """Persist and queue a workflow trigger; returns immediately."""
+    _start_workflow_dispatcher()
+    entry = {
+        "confirmation_code": confirmation_code,
+        "company_name": company_name,
+        "workflow_id": PAPERSPACE_WORKFLOW_ID,
+        "params": params,
+    }
+    with _workflow_lock:
+        _pending_workflows[confirmation_code] = entry
+        _save_pending_workflows()
+    _set_job(confirmation_code, workflow_status="queued")
+    _workflow_queue.put(entry)
+
+def _resume_pending_workflows():
+    """
+    Start the dispatcher at boot if a dead process left triggers pending.
+    
+    Safe to call in every gunicorn worker: only the worker holding
+    WORKFLOW_QUEUE_LOCK adopts orphaned queue files, and live workers'
+    files are never touched.
+    """
+    if not (GRADIENT_SDK_AVAILABLE and PAPERSPACE_API_KEY):
+        return
+    if _orphaned_queue_files() and _acquire_adopt_lock():
+        _start_workflow_dispatcher()
+
+def trigger_paperspace_workflow(company_name: str, request_data: dict, storage: CloudStorage, logger,
+                                confirmation_code: str = ""):
+    """
+    Queue a Paperspace Workflow run for the pipeline.
+    
+    The API call is made by the dispatcher thread with retries; True means
+    the trigger was queued (and persisted), not that the run has started.
+    """
     try:
         if not GRADIENT_SDK_AVAILABLE:
             logger.warning("Gradient SDK not available. Cannot trigger workflow.")
@@ -272,9 +775,6 @@ def trigger_paperspace_workflow(company_name: str, request_data: dict, storage:
             logger.warning("PAPERSPACE_API_KEY or PAPERSPACE_PROJECT_ID not configured")
             return False
         
-        # Create workflow client
-        client = WorkflowsClient(api_key=PAPERSPACE_API_KEY)
-        
         # Prepare workflow parameters
         use_cases_count = parse_use_cases_count(request_data)
         
@@ -291,19 +791,19 @@ def trigger_paperspace_workflow(company_name: str, request_data: dict, storage:
         
         logger.info(f"Triggering Paperspace Workflow for {company_name}")
         logger.info(f"Workflow ID: {PAPERSPACE_WORKFLOW_ID}")
-        logger.info(f"Parameters: {json.dumps(params, indent=2)}")
-        
-        # Trigger the workflow
-        run = client.run_workflow(
-            workflow_id=PAPERSPACE_WORKFLOW_ID,
-            inputs=params
-        )
+        if ORJSON_AVAILABLE:
+            params_text = orjson.dumps(params, option=orjson.OPT_INDENT_2).decode()
+        else:
+            params_text = json.dumps(params, indent=2)
+        logger.info(f"Parameters: {params_text}")
         
-        logger.success(f"Workflow triggered successfully. Run ID: {run.id}")
+        # Hand off to the dispatcher thread
+        _enqueue_workflow(confirmation_code or f"WF_{uuid.uuid4().hex[:12]}", company_name, params)
+        logger.info("Workflow trigger queued")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to trigger Paperspace Workflow: {e}")
+        logger.error(f"Failed to queue Paperspace Workflow: {e}")
         return False
 
 # -----------------------------------------------------------------------------
@@ -345,21 +845,22 @@ def handle_submission():
         if "json_data" in request.form:
             try:
                 raw_json = request.form["json_data"]
-                request_data = json.loads(raw_json)
-                company_name = extract_company_name(request_data, dict(request.form))
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                request_data = orjson.loads(raw_json) if ORJSON_AVAILABLE else json.loads(raw_json)
+                company_name = extract_company_name(request_data, request.form)
             except json.JSONDecodeError as e:
                 base_logger.error(f"JSON decode error: {e}")
                 request_data = {"json_decode_error": str(e)}
         elif request.is_json:
             request_data = request.get_json(silent=True) or {}
-            company_name = extract_company_name(request_data, dict(request.form))
+            company_name = extract_company_name(request_data, request.form)
         else:
-            request_data = dict(request.form)
-            company_name = extract_company_name(request_data, request_data)
+            request_data = request.form.to_dict()
+            company_name = extract_company_name(request_data, request.form)
 
         # Create company-specific logger and storage
         logger = create_logger("webhook_handler", company_name)
-        storage = CloudStorage(company_name)
+        storage = _get_storage(company_name)
         
         logger.info(f"Processing submission for company: {company_name}")
         
@@ -372,77 +873,62 @@ def handle_submission():
         
         # Handle file uploads
         files_saved = 0
+        seen_names = set()
         for key, file in request.files.items():
             if not file or not file.filename:
                 continue
             
-            fname = secure_filename(file.filename)
+            fname = _safe_filename(file.filename)
             if not fname:
                 fname = f"upload_{int(time.time()*1000)}"
+            # Two uploads named e.g. report.pdf would otherwise overwrite each other
+            fname = _unique_name(fname, seen_names)
             
-            file_content = file.read()
-            file_path = storage.save_uploaded_file(file_content, fname)
+            # Copy Werkzeug's spooled upload straight to disk (sendfile when spooled to a
+            # temp file); FileStorage.save would go through a 16KB copyfileobj loop
+            file_path = storage.save_uploaded_stream(file.stream, fname)
             files_saved += 1
-            logger.success(f"Saved file: {fname} ({len(file_content)} bytes)")
-        
-        # Save Google Drive link if provided
-        gdrive_link = (
-            request_data.get("google_drive_link")
-            or request_data.get("Google Drive Link")
-            or request_data.get("googleDriveLink")
-        )
-        if gdrive_link:
-            storage.save_gdrive_link(gdrive_link)
-            logger.info(f"Saved Google Drive link")
-            
-            # Attempt to download files from Google Drive
-            try:
-                gdrive_dir = storage.temp_dir / "drive_download"
-                if try_download_gdrive_service_account(str(gdrive_link), gdrive_dir, logger):
-                    # Move downloaded files to data directory
-                    for item in gdrive_dir.rglob('*'):
-                        if item.is_file():
-                            dest = storage.data_dir / item.name
-                            item.rename(dest)
-                            logger.info(f"Moved downloaded file: {item.name}")
-            except Exception as e:
-                logger.error(f"Google Drive download failed: {e}")
-        
-        # Log storage stats
-        stats = storage.get_storage_stats()
-        logger.metric("data_files", stats["data_files"])
-        logger.metric("total_size_bytes", stats["total_size_bytes"])
+            logger.success(f"Saved file: {fname} ({file_path.stat().st_size} bytes)")
         
-        # Trigger Paperspace Workflow (instead of local pipeline)
-        workflow_triggered = trigger_paperspace_workflow(
-            company_name, request_data, storage, logger
-        )
+        # Drive download and workflow trigger run in the background
+        _set_job(confirmation_code, status="queued", company_name=company_name, files_saved=files_saved)
+        _submission_executor.submit(_process_submission, company_name, request_data, confirmation_code)
         
-        # Return success response
+        # Return accepted response
         response = {
-            "status": "success",
-            "message": "Submission received and saved successfully",
+            "status": "accepted",
+            "message": "Submission received and saved; processing in background",
             "confirmation_code": confirmation_code,
             "company_name": company_name,
             "files_saved": files_saved,
-            "workflow_triggered": workflow_triggered,
+            "status_url": f"/status/{confirmation_code}",
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
         }
         
-        logger.success(f"Webhook processing complete. Confirmation: {confirmation_code}")
-        return jsonify(response), 200
+        logger.success(f"Submission queued. Confirmation: {confirmation_code}")
+        return jsonify(response), 202
         
     except Exception as e:
         base_logger.error(f"Error in handle_submission: {e}", exc_info=True)
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
+@app.route("/status/<confirmation_code>", methods=["GET"])
+def get_submission_status(confirmation_code: str):
+    """Poll background processing status for a submission."""
+    with _jobs_lock:
+        job = _jobs.get(confirmation_code)
+        job = dict(job) if job else None
+    if job is None:
+        return jsonify({"error": f"Unknown confirmation code: {confirmation_code}"}), 404
+    return jsonify(job), 200
+
 @app.route("/storage/<company_slug>", methods=["GET"])
 def get_storage_stats(company_slug: str):
     """Get storage statistics for a company."""
     try:
         # Reverse slugify to approximate company name
         company_name = company_slug.replace("_", " ").title()
-        storage = CloudStorage(company_name)
+        storage = _get_storage(company_name)
         stats = storage.get_storage_stats()
         return jsonify(stats), 200
     except Exception as e:
@@ -466,6 +952,29 @@ def main():
     # Use production WSGI server in cloud, development server locally
     if Path("/outputs").exists():
         # Cloud environment - use gunicorn or waitress
+        gunicorn_bin = shutil.which("gunicorn")
+        if gunicorn_bin:
+            # gevent workers yield on socket I/O (Drive, Paperspace API); gthread otherwise
+            if importlib.util.find_spec("gevent") is not None:
+                worker_args = ["-k", "gevent", "--worker-connections", str(WEBHOOK_WORKER_CONNECTIONS)]
+            else:
+                worker_args = ["-k", "gthread", "--threads", str(WEBHOOK_THREADS)]
+            argv = [
+                gunicorn_bin,
+                *worker_args,
+                "-w", str(WEBHOOK_WORKERS),
+                "-b", f"0.0.0.0:{port}",
+                "--timeout", "120",
+                "paperspace.webhook_server_cloud:app",
+            ]
+            base_logger.info(f"Using Gunicorn WSGI server: {' '.join(argv[1:])}")
+            # exec skips atexit: flush the queue listener and buffered file handler first
+            base_logger.close()
+            logging.shutdown()
+            os.chdir(ROOT_DIR)
+            os.execv(gunicorn_bin, argv)
+        
+        _resume_pending_workflows()
         try:
             from waitress import serve
             base_logger.info("Using Waitress WSGI server")
@@ -474,10 +983,15 @@ def main():
             base_logger.warning("Waitress not available, using Flask dev server")
             app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
     else:
-        # Local development
-        base_logger.info("Using Flask development server")
-        app.run(host="0.0.0.0", port=port, debug=True, threaded=True)
+        # Local development; reloader/debugger only on request. Stays threaded:
+        # processes=N forks per request, killing queued background jobs with the child.
+        debug = os.environ.get("FLASK_DEBUG") == "1"
+        base_logger.info(f"Using Flask development server (debug={debug})")
+        app.run(host="0.0.0.0", port=port, debug=debug, threaded=True)
 
 if __name__ == "__main__":
     main()
+else:
+    # Imported as the WSGI app (gunicorn workers)
+    _resume_pending_workflows()
 